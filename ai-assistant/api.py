@@ -2,6 +2,7 @@
 Simple FastAPI wrapper exposing a /api/query endpoint for RAG queries.
 """
 from fastapi import FastAPI, Header, HTTPException, Request, UploadFile, File, Form
+import asyncio
 import threading
 import time
 import shutil
@@ -22,7 +23,7 @@ from src.utils.feature_proposals import approve_proposal as approve_feature_prop
 from src.utils.rss_collector import load_sources as rss_load_sources
 from src.utils.rss_collector import add_source as rss_add_source
 from src.utils.rss_collector import remove_source as rss_remove_source
-from src.utils.rss_collector import collect_from_sources as rss_collect
+from src.utils.rss_collector import collect_from_sources_async as rss_collect_async
 from src.utils.local_doc_ingest import ingest_local_docs_to_clean
 from src.utils.local_doc_ingest import build_vector_store_from_clean
 from src.utils.local_doc_ingest import load_local_docs_state
@@ -2648,14 +2649,15 @@ async def mobile_ui():
 @app.post("/api/generate/code")
 async def generate_code(req: CodeRequest, x_api_key: str = Header(default=None)):
     _check_token(x_api_key)
-    code = assistant.generate_code(req.requirement, req.language)
+    # The LLM call blocks; run it off the event loop so other requests keep being served
+    code = await asyncio.to_thread(assistant.generate_code, req.requirement, req.language)
     return {"code": code}
 
 
 @app.post("/api/generate/ui")
 async def generate_ui(req: UIRequest, x_api_key: str = Header(default=None)):
     _check_token(x_api_key)
-    html = assistant.generate_ui(req.description)
+    html = await asyncio.to_thread(assistant.generate_ui, req.description)
     return {"html": html}
 
 
@@ -2868,7 +2870,8 @@ async def rss_collect_api(req: RssCollectRequest, x_api_key: str = Header(defaul
     _check_token(x_api_key)
     sources = rss_load_sources()
     max_items = req.max_items or Config.RSS_MAX_ITEMS
-    urls = rss_collect(sources, max_items=max_items)
+    # Fetch on the server's own event loop instead of blocking it
+    urls = await rss_collect_async(sources, max_items=max_items)
     # append to watchlist
     try:
         existing = []
@@ -119,6 +119,15 @@ class Config:
 
     # Learning brains
     USE_MULTI_TEACHER = False
+    MULTI_TEACHER_BATCH_MAX = 8
+    MULTI_TEACHER_BATCH_WINDOW_MS = 20
+    MULTI_TEACHER_CACHE_SIZE = 1024
+    # Use each teacher's own base_url (TeacherConfig.TEACHERS) instead of the shared provider URL
+    MULTI_TEACHER_PER_TEACHER_URLS = os.getenv("AI_ASSISTANT_MULTI_TEACHER_PER_TEACHER_URLS", "0") == "1"
+    ENSEMBLE_LOG_FLUSH_EVERY = 16
+
+    # Perfection system: specialties crawled in parallel per learning cycle
+    LEARNING_CRAWL_CONCURRENCY = 3
 
     # Code search
     SEARCH_MAX_FILES = 200
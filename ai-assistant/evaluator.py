@@ -4,6 +4,7 @@ Provides token-overlap ratio (very rough) as a quality signal.
 """
 import re
 from collections import Counter
+from functools import lru_cache
 try:
     import sacrebleu
 except Exception:
@@ -18,9 +19,7 @@ WORD_RE = re.compile(r"\w+", re.UNICODE)
 def tokenize(text: str):
     return WORD_RE.findall(text.lower())
 
-def overlap_score(ref: str, hyp: str) -> float:
-    r = tokenize(ref)
-    h = tokenize(hyp)
+def overlap_from_tokens(r: list, h: list) -> float:
     if not r or not h:
         return 0.0
     cr = Counter(r)
@@ -29,6 +28,9 @@ def overlap_score(ref: str, hyp: str) -> float:
     denom = max(len(r), len(h))
     return common / denom
 
+def overlap_score(ref: str, hyp: str) -> float:
+    return overlap_from_tokens(tokenize(ref), tokenize(hyp))
+
 def bleu_score(ref: str, hyp: str) -> float:
     if sacrebleu is None:
         return 0.0
@@ -38,11 +40,16 @@ def bleu_score(ref: str, hyp: str) -> float:
     except Exception:
         return 0.0
 
+@lru_cache(maxsize=4)
+def _get_rouge_scorer(rouge_types: tuple):
+    # Building a scorer sets up the tokenizer and stemmer; reuse it across calls
+    return rouge_scorer.RougeScorer(list(rouge_types), use_stemmer=True)
+
 def rouge_scores(ref: str, hyp: str) -> dict:
     if rouge_scorer is None:
         return {'rouge1': 0.0, 'rouge2': 0.0, 'rougeL': 0.0}
     try:
-        scorer = rouge_scorer.RougeScorer(['rouge1','rouge2','rougeL'], use_stemmer=True)
+        scorer = _get_rouge_scorer(('rouge1', 'rouge2', 'rougeL'))
         sc = scorer.score(ref, hyp)
         return {
             'rouge1': sc['rouge1'].fmeasure,
@@ -53,6 +60,21 @@ def rouge_scores(ref: str, hyp: str) -> dict:
         return {'rouge1': 0.0, 'rouge2': 0.0, 'rougeL': 0.0}
 
 
+def score_all(ref: str, hyp: str) -> dict:
+    """Overlap, BLEU and ROUGE-L for one pair (only the ROUGE-L variant is computed)"""
+    scores = {
+        'overlap': overlap_from_tokens(tokenize(ref), tokenize(hyp)),
+        'bleu': bleu_score(ref, hyp),
+        'rougeL': 0.0,
+    }
+    if rouge_scorer is not None:
+        try:
+            scores['rougeL'] = _get_rouge_scorer(('rougeL',)).score(ref, hyp)['rougeL'].fmeasure
+        except Exception:
+            pass
+    return scores
+
+
 if __name__ == '__main__':
     ref = 'これはテストです。正しい出力を確認します。'
     hyp = 'これはテストです。出力を確認します。'
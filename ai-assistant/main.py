@@ -16,6 +16,7 @@ from model_3d_generator import Model3DGenerator
 from idle_mode import IdleMode
 from vector_store import VectorStore
 from patch_validator import PatchValidator
+from src.utils.code_search import scandir_recursive
 
 # Configure logging
 _root_logger = logging.getLogger()
@@ -37,6 +38,8 @@ _root_logger.addHandler(_console_handler)
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"\s+")
+
 class AIAssistant:
     def __init__(self):
         logger.info("Initializing AI Assistant...")
@@ -63,6 +66,8 @@ class AIAssistant:
         self.vs = VectorStore()
         self._rag_cache = {}
         self._rag_cache_order = []
+        self._auto_patch_exts = tuple(Config.AUTO_PATCH_CANDIDATE_EXTS or (".py",))
+        self._auto_patch_excludes = frozenset(Config.AUTO_PATCH_EXCLUDE_DIRS or ())
         
         logger.info("AI Assistant initialized successfully")
     
@@ -140,9 +145,10 @@ class AIAssistant:
         except Exception:
             results = []
 
-        context = ''
+        parts = []
         for r in results:
-            context += f"[Source: {r['meta'].get('source','')}]\n{r['text']}\n\n"
+            parts.append(f"[Source: {r['meta'].get('source','')}]\n{r['text']}\n\n")
+        context = ''.join(parts)
 
         prompt = f"以下の参考資料を参照して、ユーザーの質問に日本語で答えてください。\n\n参考資料:\n{context}\n質問:\n{query}\n\n回答："
         answer = self.llm.generate(prompt, temperature=0.2, max_tokens=800)
@@ -420,31 +426,26 @@ class AIAssistant:
         return None
 
     def _find_relevant_files(self, instruction: str, max_files: int = 4) -> list[str]:
-        tokens = [t for t in re.split(r"\s+", instruction) if t]
+        tokens = [t for t in _TOKEN_RE.split(instruction) if t]
         keywords = [t for t in tokens if len(t) >= 2][:8]
-        exts = set(Config.AUTO_PATCH_CANDIDATE_EXTS or [".py"])
-        exclude_dirs = set(Config.AUTO_PATCH_EXCLUDE_DIRS or [])
+        if not keywords:
+            return []
+        exts = self._auto_patch_exts
+        exclude_dirs = self._auto_patch_excludes
         hits = []
 
-        for p in Config.PROJECT_ROOT.rglob("*"):
-            if p.is_dir():
-                if p.name in exclude_dirs:
-                    continue
-                continue
-            if p.suffix not in exts:
-                continue
-            parts = set(p.parts)
-            if parts.intersection(exclude_dirs):
+        # Excluded dirs are pruned during the walk, so their contents are never listed
+        for entry in scandir_recursive(Config.PROJECT_ROOT, exclude_dirs):
+            if not entry.name.endswith(exts):
                 continue
+            p = Path(entry.path)
             rel = p.relative_to(Config.PROJECT_ROOT).as_posix()
             try:
                 content = p.read_text(encoding="utf-8", errors="ignore")
             except Exception:
                 continue
-            score = 0
-            for kw in keywords:
-                if kw in content or kw in rel:
-                    score += 1
+            # Plain substring checks: an alternation regex would let "login" hide "log"
+            score = sum(1 for kw in keywords if kw in content or kw in rel)
             if score > 0:
                 hits.append((score, rel))
             if len(hits) > 200:
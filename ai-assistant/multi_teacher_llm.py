@@ -11,18 +11,42 @@ Status: Perfect AI Phase 1 で導入、継続拡張中
 """
 
 import asyncio
+import atexit
+import functools
+import hashlib
+import heapq
 import logging
 import json
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Any
 from datetime import datetime
 from pathlib import Path
 
+import aiohttp
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from config import Config
 from llm_manager import LLMManager
+from src.utils.file_manager import atomic_write_text
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+
+def _dumps_line(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 class TeacherConfig:
     """Configuration for teacher models"""
     
@@ -61,21 +85,126 @@ class TeacherConfig:
         'explanation': {'neural-chat': 0.4, 'llama2': 0.3, 'mistral': 0.2, 'codegemma': 0.1},
     }
 
+class TeacherBatcher:
+    """
+    Micro-batcher in front of a single teacher
+    Prompts arriving within a short window are dispatched together, and
+    identical requests in the same window share one backend call
+    """
+    
+    def __init__(self, dispatch, max_batch: int, window_ms: int):
+        self._dispatch = dispatch
+        self._max_batch = max(1, max_batch)
+        self._window = max(0, window_ms) / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._inflight = set()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def submit(self, prompt: str, **kwargs) -> str:
+        """Queue a prompt and wait for its response"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, kwargs, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Keep collecting the next window while this batch is in flight
+            task = loop.create_task(self._flush(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _flush(self, batch: List[Tuple[str, Dict, asyncio.Future]]):
+        grouped: Dict[Tuple, List[asyncio.Future]] = {}
+        for prompt, kwargs, future in batch:
+            key = (prompt, tuple(sorted(kwargs.items())))
+            grouped.setdefault(key, []).append(future)
+        
+        loop = asyncio.get_running_loop()
+        calls = []
+        for (prompt, items), futures in grouped.items():
+            waiters = [f for f in futures if not f.done()]
+            if not waiters:
+                continue
+            call = loop.create_task(self._dispatch(prompt, **dict(items)))
+            call.add_done_callback(functools.partial(self._resolve, waiters))
+            for future in waiters:
+                future.add_done_callback(functools.partial(self._abandon, call, waiters))
+            calls.append(call)
+        if calls:
+            await asyncio.gather(*calls, return_exceptions=True)
+    
+    @staticmethod
+    def _resolve(waiters: List[asyncio.Future], call: asyncio.Task):
+        for future in waiters:
+            if future.done():
+                continue
+            if call.cancelled():
+                future.cancel()
+            elif call.exception() is not None:
+                future.set_exception(call.exception())
+            else:
+                future.set_result(call.result())
+    
+    @staticmethod
+    def _abandon(call: asyncio.Task, waiters: List[asyncio.Future], _future: asyncio.Future):
+        # Nobody is waiting for this call any more: stop the upstream request too
+        if not call.done() and all(f.done() for f in waiters):
+            call.cancel()
+    
+    async def close(self):
+        """Stop the batching loop and cancel requests still in flight"""
+        tasks = [self._task, *self._inflight]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 class MultiTeacherLLM:
     """
     Multi-teacher learning system
     Queries multiple models in parallel and intelligently combines responses
     """
     
+    # The best response is used alone once its weighted score is more than this many
+    # times the runner-up's. A ratio, not an absolute gap: weighted scores are at most
+    # max(TASK_WEIGHTS) (0.4), so a fixed 0.3 gap could never be reached
+    CLEAR_WINNER_RATIO = 2.0
+    
     def __init__(self):
         self.teachers: Dict[str, LLMManager] = {}
         self.config = TeacherConfig()
-        self.response_cache = {}
+        self.response_cache: OrderedDict = OrderedDict()
         self.ensemble_log = Config.DATA_DIR / 'ensemble_log.jsonl'
         self.ensemble_log.parent.mkdir(exist_ok=True)
+        self.ensemble_stats_file = Config.DATA_DIR / 'ensemble_log.stats.json'
+        self._stats = self._load_ensemble_stats()
+        self._log_fh = None
+        self._log_pending = 0
+        atexit.register(self.flush_log)
+        self._session: aiohttp.ClientSession = None
+        self._session_loop = None
+        self._batchers: Dict[str, TeacherBatcher] = {}
+        self._batchers_loop = None
         
         # Initialize teachers
         self._init_teachers()
+        
+        # Per-task weights aligned with the fixed teacher order
+        self._teacher_order: Tuple[str, ...] = tuple(self.teachers)
+        self._task_weight_vec: Dict[str, Tuple[float, ...]] = {
+            task: tuple(task_weights.get(name, 0.1) for name in self._teacher_order)
+            for task, task_weights in self.config.TASK_WEIGHTS.items()
+        }
     
     def _init_teachers(self):
         """Initialize connections to all teacher models"""
@@ -83,22 +212,121 @@ class MultiTeacherLLM:
             try:
                 # Create LLMManager for each teacher
                 teacher = LLMManager(model_name=config['model'])
-                teacher.base_url = config['base_url']
+                if Config.MULTI_TEACHER_PER_TEACHER_URLS:
+                    teacher.base_url = config['base_url']
                 self.teachers[name] = teacher
                 logger.info(f'✅ Teacher "{name}" initialized')
             except Exception as e:
                 logger.warning(f'⚠️  Teacher "{name}" not available: {e}')
     
-    async def query_teacher(self, teacher_name: str, prompt: str, **kwargs) -> str:
-        """Query a single teacher model"""
+    async def start_session(self) -> aiohttp.ClientSession:
+        """Initialize (or reuse) the shared async HTTP session for the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=32)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+    
+    def _get_batcher(self, teacher_name: str) -> TeacherBatcher:
+        """Get the micro-batcher for a teacher on the running loop"""
+        loop = asyncio.get_running_loop()
+        if self._batchers_loop is not loop:
+            self._batchers = {}
+            self._batchers_loop = loop
+        batcher = self._batchers.get(teacher_name)
+        if batcher is None:
+            async def dispatch(prompt: str, **kwargs) -> str:
+                return await self.query_teacher(teacher_name, prompt, **kwargs)
+            batcher = TeacherBatcher(
+                dispatch,
+                max_batch=Config.MULTI_TEACHER_BATCH_MAX,
+                window_ms=Config.MULTI_TEACHER_BATCH_WINDOW_MS,
+            )
+            self._batchers[teacher_name] = batcher
+        return batcher
+    
+    async def close_session(self):
+        """Close async session"""
+        if self._batchers_loop is asyncio.get_running_loop():
+            for batcher in self._batchers.values():
+                await batcher.close()
+        self._batchers = {}
+        self._batchers_loop = None
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    def _resolve_teacher_url(self, teacher_name: str) -> str:
+        """
+        Base URL for a teacher: the shared provider endpoint (Ollama or the internal
+        LLM), like LLMManager.generate, unless per-teacher URLs are enabled
+        """
+        teacher = self.teachers[teacher_name]
+        if Config.MULTI_TEACHER_PER_TEACHER_URLS:
+            teacher.base_url = self.config.TEACHERS[teacher_name]['base_url']
+            return teacher.base_url
+        teacher._resolve_provider()
+        if teacher.provider == 'internal' and not Config.INTERNAL_LLM_BASE_URL:
+            return ''
+        return teacher.base_url
+    
+    async def query_teacher(self, teacher_name: str, prompt: str, temperature: float = 0.7,
+                            max_tokens: int = None) -> str:
+        """Query a single teacher model over a non-blocking HTTP request"""
         if teacher_name not in self.teachers:
             logger.warning(f'Teacher {teacher_name} not available')
             return ''
         
+        cache_key = (
+            teacher_name,
+            hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).digest(),
+            round(temperature, 2),
+            max_tokens,
+        )
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self.response_cache.move_to_end(cache_key)
+            return cached
+        
         teacher = self.teachers[teacher_name]
+        base_url = self._resolve_teacher_url(teacher_name)
+        if not base_url:
+            logger.warning(f'Teacher {teacher_name}: internal LLM is not configured')
+            return ''
+        # Pull the model on first use (blocking check, so keep it off the loop)
+        if not teacher._model_checked and not await asyncio.to_thread(teacher._ensure_model_available):
+            logger.warning(f'Teacher {teacher_name}: model {teacher.model_name} is not available')
+            return ''
+        
+        teacher_config = self.config.TEACHERS[teacher_name]
+        payload = {
+            'model': teacher_config['model'],
+            'prompt': prompt,
+            'stream': False,
+            'temperature': temperature,
+            'top_p': Config.LLM_TOP_P,
+            'repeat_penalty': Config.LLM_REPEAT_PENALTY,
+            'num_predict': max_tokens or Config.LLM_MAX_TOKENS,
+        }
         try:
-            response = teacher.generate(prompt, **kwargs)
-            return response
+            session = await self.start_session()
+            timeout = aiohttp.ClientTimeout(total=Config.LLM_TIMEOUT_SECONDS)
+            async with session.post(f'{base_url}/api/generate',
+                                    json=payload, timeout=timeout) as resp:
+                resp.raise_for_status()
+                result = await resp.json()
+            text = (result.get('response') or '').strip()
+            if text:
+                self.response_cache[cache_key] = text
+                limit = Config.MULTI_TEACHER_CACHE_SIZE
+                if limit and len(self.response_cache) > limit:
+                    self.response_cache.popitem(last=False)
+            return text
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f'Teacher {teacher_name} request failed: {e}')
+            return ''
         except Exception as e:
             logger.error(f'Error querying {teacher_name}: {e}')
             return ''
@@ -108,55 +336,85 @@ class MultiTeacherLLM:
         """Query all available teachers in parallel"""
         available_teachers = list(self.teachers.keys())
         
+        weights = dict(zip(self._teacher_order, self._weight_vector(task_type)))
+        
         # Create tasks for parallel execution
-        tasks = [
-            self.query_teacher(name, prompt, **kwargs)
+        tasks = {
+            asyncio.ensure_future(self._get_batcher(name).submit(prompt, **kwargs)): name
             for name in available_teachers
-        ]
-        
-        # Execute in parallel
-        responses = await asyncio.gather(*tasks)
-        
-        # Combine into dict
-        result = {
-            name: response
-            for name, response in zip(available_teachers, responses)
         }
         
+        # Collect responses as they arrive; stop early once one teacher is a clear winner
+        result = {name: '' for name in available_teachers}
+        weighted = []
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                try:
+                    response = task.result()
+                except Exception as e:
+                    logger.error(f'Error querying {name}: {e}')
+                    response = ''
+                result[name] = response
+                if response:
+                    weighted.append(self.score_response(response) * weights.get(name, 0.1))
+            
+            if pending and weighted:
+                # Best possible weighted score of any teacher still running (score <= 1.0)
+                ranked = sorted(weighted, reverse=True)
+                runner_up = max(
+                    ranked[1] if len(ranked) > 1 else 0.0,
+                    max(weights.get(tasks[task], 0.1) for task in pending),
+                )
+                if ranked[0] > self.CLEAR_WINNER_RATIO * runner_up:
+                    for task in pending:
+                        task.cancel()
+                    logger.info(f'Clear winner found; cancelled {len(pending)} pending teachers')
+                    break
+        
         logger.info(f'Received responses from {len([r for r in result.values() if r])} teachers')
         return result
     
-    def _calculate_weights(self, task_type: str) -> Dict[str, float]:
-        """Get weights for task-specific ensemble"""
-        task_weights = self.config.TASK_WEIGHTS.get(task_type)
-        if task_weights is None:
-            task_weights = self.config.TASK_WEIGHTS['general']
-        return task_weights
+    def _weight_vector(self, task_type: str) -> Tuple[float, ...]:
+        """Get precomputed weights for a task, aligned with self._teacher_order"""
+        vec = self._task_weight_vec.get(task_type)
+        if vec is None:
+            vec = self._task_weight_vec['general']
+        return vec
     
     def score_response(self, response: str, reference: str = None) -> float:
         """Score a response (1.0 = perfect, 0.0 = terrible)"""
-        if not response or len(response) < 10:
+        length = len(response) if response else 0
+        if length < 10:
             return 0.0
         
         # Simple heuristics (can be enhanced)
         score = 0.5  # baseline
         
         # Length bonus
-        if len(response) > 100:
+        if length > 100:
             score += 0.2
-        elif len(response) > 50:
+        elif length > 50:
             score += 0.1
         
-        # Coherence (simple check)
-        if response.count('.') > 2:
+        # Coherence (simple check): stop scanning once a third period is seen
+        periods = 0
+        pos = response.find('.')
+        while pos != -1 and periods <= 2:
+            periods += 1
+            pos = response.find('.', pos + 1)
+        if periods > 2:
             score += 0.15
         
-        if reference and response.lower() in reference.lower():
+        # A response longer than the reference cannot be contained in it
+        if reference and length <= len(reference) and response.lower() in reference.lower():
             score += 0.15
         
         return min(score, 1.0)
     
-    def merge_responses(self, responses: Dict[str, str], weights: Dict[str, float],
+    def merge_responses(self, responses: Dict[str, str], weights: Dict[str, float] = None,
                        task_type: str = 'general') -> Tuple[str, Dict]:
         """Intelligently merge multiple responses"""
         
@@ -172,9 +430,17 @@ class MultiTeacherLLM:
         
         # Weight by teacher specialty + response quality
         weighted_scores = {}
-        for name, score in scores.items():
-            teacher_weight = weights.get(name, 0.1)
-            weighted_scores[name] = score * teacher_weight
+        if weights is None:
+            for name, teacher_weight in zip(self._teacher_order, self._weight_vector(task_type)):
+                score = scores.get(name)
+                if score is not None:
+                    weighted_scores[name] = score * teacher_weight
+            for name in scores.keys() - weighted_scores.keys():
+                weighted_scores[name] = scores[name] * 0.1
+        else:
+            for name, score in scores.items():
+                teacher_weight = weights.get(name, 0.1)
+                weighted_scores[name] = score * teacher_weight
         
         # Sort by score
         ranked = sorted(weighted_scores.items(), key=lambda x: x[1], reverse=True)
@@ -193,21 +459,21 @@ class MultiTeacherLLM:
                         weighted_scores: Dict[str, float]) -> str:
         """Merge responses by weighted voting"""
         
-        # Get top 2-3 responses
-        best_responses = sorted(
+        # Get top 2-3 responses (partial selection; same order as a full sort)
+        best_responses = heapq.nlargest(
+            3,
             [(name, responses[name]) for name in weighted_scores if responses.get(name)],
             key=lambda x: weighted_scores[x[0]],
-            reverse=True
-        )[:3]
+        )
         
         if not best_responses:
             return ''
         
         # If there's a clear winner (2x better than second), use it
         if len(best_responses) > 1:
-            score_diff = weighted_scores.get(best_responses[0][0], 0) - \
-                        weighted_scores.get(best_responses[1][0], 0)
-            if score_diff > 0.3:
+            best_score = weighted_scores.get(best_responses[0][0], 0)
+            second_score = weighted_scores.get(best_responses[1][0], 0)
+            if best_score > self.CLEAR_WINNER_RATIO * second_score:
                 logger.info(f'Using best teacher: {best_responses[0][0]}')
                 return best_responses[0][1]
         
@@ -228,13 +494,9 @@ class MultiTeacherLLM:
         # Extract key points from other responses
         additional_points = []
         for name, response in best_responses[1:]:
-            sentences = response.split('.')
-            if sentences:
-                # Add first substantive sentence
-                for s in sentences:
-                    if len(s.strip()) > 20:
-                        additional_points.append(s.strip())
-                        break
+            sentence = self._first_long_sentence(response)
+            if sentence:
+                additional_points.append(sentence)
         
         # Combine
         if additional_points:
@@ -243,6 +505,21 @@ class MultiTeacherLLM:
         
         return main_response
     
+    @staticmethod
+    def _first_long_sentence(response: str, min_length: int = 20) -> str:
+        """Return the first '.'-delimited sentence longer than min_length (stripped)"""
+        start = 0
+        end = len(response)
+        while start <= end:
+            stop = response.find('.', start)
+            if stop == -1:
+                stop = end
+            sentence = response[start:stop].strip()
+            if len(sentence) > min_length:
+                return sentence
+            start = stop + 1
+        return ''
+    
     async def generate_ensemble(self, prompt: str, task_type: str = 'general',
                                temperature: float = 0.7) -> Tuple[str, Dict]:
         """
@@ -251,9 +528,6 @@ class MultiTeacherLLM:
         """
         logger.info(f'Starting ensemble generation for task: {task_type}')
         
-        # Get weights for this task
-        weights = self._calculate_weights(task_type)
-        
         # Query all teachers
         responses = await self.query_all_teachers(
             prompt,
@@ -262,7 +536,7 @@ class MultiTeacherLLM:
         )
         
         # Merge responses
-        merged, metadata = self.merge_responses(responses, weights, task_type)
+        merged, metadata = self.merge_responses(responses, task_type=task_type)
         
         # Log
         self._log_ensemble(prompt, responses, merged, metadata, task_type)
@@ -272,17 +546,101 @@ class MultiTeacherLLM:
     def _log_ensemble(self, prompt: str, responses: Dict[str, str], 
                      merged: str, metadata: Dict, task_type: str):
         """Log ensemble operation for analysis"""
+        responses_count = len([r for r in responses.values() if r])
         log_entry = {
             'timestamp': datetime.now().isoformat(),
             'task_type': task_type,
             'prompt': prompt[:200],  # truncate
-            'responses_count': len([r for r in responses.values() if r]),
+            'responses_count': responses_count,
             'merged_length': len(merged),
-            'metadata': metadata,
+            'metadata': self._compact_metadata(metadata),
         }
         
-        with open(self.ensemble_log, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+        if self._log_fh is None:
+            self._log_fh = open(self.ensemble_log, 'ab', buffering=1 << 16)
+        self._log_fh.write(_dumps_line(log_entry))
+        
+        self._log_pending += 1
+        if self._log_pending >= Config.ENSEMBLE_LOG_FLUSH_EVERY:
+            self.flush_log()
+    
+    @staticmethod
+    def _compact_metadata(metadata: Dict) -> Dict:
+        """Round scores (0-1) to 3 places for logging; other fields pass through"""
+        compact = dict(metadata)
+        for key in ('scores', 'weighted_scores'):
+            if isinstance(compact.get(key), dict):
+                compact[key] = {name: round(v, 3) for name, v in compact[key].items()}
+        if isinstance(compact.get('ranking'), list):
+            compact['ranking'] = [[name, round(v, 3)] for name, v in compact['ranking']]
+        return compact
+    
+    def flush_log(self):
+        """Flush buffered ensemble log lines and persist the aggregates"""
+        if not self._log_pending:
+            return
+        try:
+            if self._log_fh is not None:
+                self._log_fh.flush()
+        except Exception as e:
+            logger.warning(f'Failed to flush ensemble log: {e}')
+        self._log_pending = 0
+        # Re-read from the log rather than saving our own counters, so
+        # lines appended by other processes are counted too
+        self._stats = self._load_ensemble_stats()
+    
+    def close_log(self):
+        """Flush and release the ensemble log handle"""
+        self.flush_log()
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+    
+    def _load_ensemble_stats(self) -> Dict[str, int]:
+        """Load running ensemble aggregates and fold in log lines written since"""
+        stats = {'count': 0, 'responses_sum': 0, 'offset': 0}
+        if self.ensemble_stats_file.exists():
+            try:
+                with open(self.ensemble_stats_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                stats = {key: int(data.get(key, 0)) for key in stats}
+            except Exception as e:
+                logger.warning(f'Ensemble stats unreadable, rebuilding: {e}')
+        
+        try:
+            size = self.ensemble_log.stat().st_size
+        except OSError:
+            size = 0
+        if size < stats['offset']:
+            # Log was truncated or replaced: rebuild from the start
+            stats = {'count': 0, 'responses_sum': 0, 'offset': 0}
+        if size == stats['offset']:
+            return stats
+        
+        with open(self.ensemble_log, 'rb') as f:
+            f.seek(stats['offset'])
+            chunk = f.read(size - stats['offset'])
+        # Only complete lines count; a partial tail is picked up next time
+        complete = chunk[:chunk.rfind(b'\n') + 1]
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entry = _loads(line)
+            except ValueError:
+                continue
+            stats['count'] += 1
+            stats['responses_sum'] += entry.get('responses_count', 0)
+        stats['offset'] += len(complete)
+        self._save_ensemble_stats(stats)
+        return stats
+    
+    def _save_ensemble_stats(self, stats: Dict[str, int]):
+        """Persist ensemble aggregates atomically"""
+        try:
+            atomic_write_text(self.ensemble_stats_file, json.dumps(stats))
+        except Exception as e:
+            logger.warning(f'Failed to save ensemble stats: {e}')
     
     def get_teacher_stats(self) -> Dict[str, Any]:
         """Get statistics about teacher performance"""
@@ -297,18 +655,16 @@ class MultiTeacherLLM:
             },
         }
         
-        # Read ensemble log
-        if self.ensemble_log.exists():
-            logs = []
-            with open(self.ensemble_log, 'r', encoding='utf-8') as f:
-                for line in f:
-                    logs.append(json.loads(line))
-            
-            if logs:
-                stats['total_ensembles'] = len(logs)
-                stats['avg_responses_per_ensemble'] = sum(
-                    l['responses_count'] for l in logs
-                ) / len(logs)
+        if self._log_pending:
+            self.flush_log()  # also folds in the log tail
+        else:
+            # Nothing of ours to flush; still pick up lines other processes appended
+            self._stats = self._load_ensemble_stats()
+        if self._stats['count']:
+            stats['total_ensembles'] = self._stats['count']
+            stats['avg_responses_per_ensemble'] = (
+                self._stats['responses_sum'] / self._stats['count']
+            )
         
         return stats
 
@@ -11,17 +11,50 @@ Status: Evolver からのパッチ提案を検証、承認時に自動適用
 """
 import json
 import logging
+import os
+import re
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from datetime import datetime
 from config import Config
 from sandbox import validate_patch, save_validation_report
 from git_utils import create_branch_and_commit
+from src.utils.file_manager import atomic_write_text
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+STATUS_SIDECAR = '.status'
+
+# Compact encoder for machine-read files; proposal.json stays indented for manual review
+_fast_dumps = partial(json.dumps, ensure_ascii=False, separators=(',', ':'))
+
+def _write_status_sidecar(proposal_dir: Path, status: str) -> None:
+    """Record the proposal status in a tiny sidecar so listings can filter without parsing JSON"""
+    try:
+        atomic_write_text(proposal_dir / STATUS_SIDECAR, status)
+    except Exception as e:
+        logger.warning(f'Failed to write status sidecar in {proposal_dir}: {e}')
+
+def _read_status_sidecar(proposal_dir: Path) -> str | None:
+    try:
+        return (proposal_dir / STATUS_SIDECAR).read_text(encoding='utf-8').strip() or None
+    except OSError:
+        return None
+
+@lru_cache(maxsize=8)
+def _compile_path_rules(deny_dirs: tuple, allowed_paths: tuple):
+    """Compile deny/allow prefix lists into anchored alternation regexes (cached per rule set)"""
+    deny_re = re.compile('|'.join(re.escape(d) for d in deny_dirs)) if deny_dirs else None
+    if '' in allowed_paths:
+        return deny_re, None, frozenset(), True
+    allow_re = re.compile('|'.join(re.escape(a) for a in allowed_paths)) if allowed_paths else None
+    allow_exact = frozenset(a.rstrip('/') for a in allowed_paths)
+    return deny_re, allow_re, allow_exact, False
+
 class PatchProposal:
     """Represents a single patch proposal"""
     
@@ -98,14 +131,13 @@ class PatchProposal:
         
         # save proposal metadata
         proposal_file = proposal_dir / 'proposal.json'
-        with open(proposal_file, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        atomic_write_text(proposal_file, json.dumps(self.to_dict(), indent=2, ensure_ascii=False))
+        _write_status_sidecar(proposal_dir, self.status)
         
         # save validation report
         if self.validation:
             validation_file = proposal_dir / 'validation.json'
-            with open(validation_file, 'w', encoding='utf-8') as f:
-                json.dump(self.validation, f, indent=2, ensure_ascii=False)
+            atomic_write_text(validation_file, _fast_dumps(self.validation))
         
         # save individual files
         files_dir = proposal_dir / 'files'
@@ -170,6 +202,11 @@ class PatchValidator:
         for patch_id_dir in patches_dir.iterdir():
             if not patch_id_dir.is_dir():
                 continue
+            if status is not None:
+                # Skip non-matching proposals without parsing proposal.json
+                sidecar_status = _read_status_sidecar(patch_id_dir)
+                if sidecar_status is not None and sidecar_status != status:
+                    continue
             proposal_file = patch_id_dir / 'proposal.json'
             if proposal_file.exists():
                 with open(proposal_file, 'r', encoding='utf-8') as f:
@@ -199,8 +236,8 @@ class PatchValidator:
         prop['status'] = 'APPROVED'
         prop['approved_at'] = datetime.now().isoformat()
         
-        with open(proposal_file, 'w', encoding='utf-8') as f:
-            json.dump(prop, f, indent=2, ensure_ascii=False)
+        atomic_write_text(proposal_file, json.dumps(prop, indent=2, ensure_ascii=False))
+        _write_status_sidecar(patches_dir, prop['status'])
         
         logger.info(f'✓ Proposal {proposal_id} approved')
         return True
@@ -210,15 +247,17 @@ class PatchValidator:
         norm = path.replace('\\', '/').lstrip('/')
         if '..' in norm or norm.startswith('./'):
             return False
-        for deny in Config.AUTO_APPLY_DENY_DIRS:
-            if norm.startswith(deny):
-                return False
-        for allow in Config.AUTO_APPLY_ALLOWED_PATHS:
-            if allow == "":
-                return True
-            if norm == allow.rstrip('/') or norm.startswith(allow):
-                return True
-        return False
+        deny_re, allow_re, allow_exact, allow_all = _compile_path_rules(
+            tuple(Config.AUTO_APPLY_DENY_DIRS or ()),
+            tuple(Config.AUTO_APPLY_ALLOWED_PATHS or ()),
+        )
+        if deny_re is not None and deny_re.match(norm):
+            return False
+        if allow_all:
+            return True
+        if norm in allow_exact:
+            return True
+        return allow_re is not None and allow_re.match(norm) is not None
 
     @staticmethod
     def _auto_apply_if_allowed(proposal: PatchProposal) -> bool:
@@ -232,20 +271,47 @@ class PatchValidator:
                 logger.warning(f'Auto-apply skipped: path not allowed: {path}')
                 return False
 
+        # Resolve and check every target before touching the filesystem
+        root = str(Config.PROJECT_ROOT.resolve())
+        write_jobs = []
+        backup_jobs = []
         backups = {}
+        backup_dir = Config.BACKUP_DIR / 'auto_apply'
         for path, content in files.items():
             target = (Config.PROJECT_ROOT / path).resolve()
-            if not str(target).startswith(str(Config.PROJECT_ROOT.resolve())):
+            if not str(target).startswith(root):
                 logger.warning(f'Auto-apply skipped: unsafe path: {path}')
                 return False
             if target.exists():
-                backup_dir = Config.BACKUP_DIR / 'auto_apply'
-                backup_dir.mkdir(parents=True, exist_ok=True)
-                backup_path = backup_dir / f"{target.name}.{proposal.id}.bak"
-                shutil.copy2(target, backup_path)
+                backup_path = backup_dir / f"{path.replace('/', '_')}.{proposal.id}.bak"
+                backup_jobs.append((target, backup_path))
                 backups[path] = str(backup_path)
+            write_jobs.append((target, content))
+
+        def _do_backup(job):
+            target, backup_path = job
+            # Hard link when possible; fall back to a copy across devices / unsupported filesystems
+            try:
+                os.link(target, backup_path)
+            except OSError:
+                shutil.copy2(target, backup_path)
+
+        def _do_write(job):
+            target, content = job
             target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_text(content, encoding='utf-8')
+            # Write a new inode and swap it in so a hard-linked backup keeps the old content
+            tmp = target.with_name(f".{target.name}.{proposal.id}.tmp")
+            tmp.write_text(content, encoding='utf-8')
+            if target.exists():
+                shutil.copymode(target, tmp)
+            os.replace(tmp, target)
+
+        # All backups complete before any target is overwritten
+        with ThreadPoolExecutor(max_workers=min(32, len(write_jobs) or 1)) as ex:
+            if backup_jobs:
+                backup_dir.mkdir(parents=True, exist_ok=True)
+                list(ex.map(_do_backup, backup_jobs))
+            list(ex.map(_do_write, write_jobs))
 
         postcheck = None
         if Config.AUTO_APPLY_POSTCHECK_ENABLED:
@@ -280,8 +346,8 @@ class PatchValidator:
             prop['backups'] = backups
         if postcheck is not None:
             prop['postcheck'] = postcheck
-        with open(proposal_file, 'w', encoding='utf-8') as f:
-            json.dump(prop, f, indent=2, ensure_ascii=False)
+        atomic_write_text(proposal_file, json.dumps(prop, indent=2, ensure_ascii=False))
+        _write_status_sidecar(patches_dir, prop.get('status', ''))
 
     @staticmethod
     def _rollback_files(backups: dict) -> None:
@@ -310,20 +376,23 @@ class PatchValidator:
 
     @staticmethod
     def _run_post_apply_checks() -> dict:
-        results = []
+        cmds = []
         timeout = int(Config.AUTO_APPLY_POSTCHECK_TIMEOUT or 60)
 
         # default: run pytest if tests directory exists
         tests_dir = Config.PROJECT_ROOT / 'tests'
         if tests_dir.exists():
-            results.append(PatchValidator._run_cmd('pytest -q', timeout))
+            cmds.append('pytest -q')
 
         # extra commands
-        for cmd in Config.AUTO_APPLY_POSTCHECK_COMMANDS or []:
-            results.append(PatchValidator._run_cmd(cmd, timeout))
+        cmds.extend(Config.AUTO_APPLY_POSTCHECK_COMMANDS or [])
 
-        if not results:
+        if not cmds:
             return {"ok": True, "skipped": True, "results": []}
+
+        # Checks are independent processes: run them side by side (results keep command order)
+        with ThreadPoolExecutor(max_workers=len(cmds)) as ex:
+            results = list(ex.map(lambda cmd: PatchValidator._run_cmd(cmd, timeout), cmds))
         ok = all(r.get("ok") for r in results)
         return {"ok": ok, "results": results}
 
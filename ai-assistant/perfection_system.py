@@ -14,6 +14,7 @@ Status: Perfect AI Phase 1・2・3・4 統合エンジン
 
 import asyncio
 import logging
+import sys
 from pathlib import Path
 
 from config import Config
@@ -24,6 +25,9 @@ from universal_crawler import UniversalCrawler
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+RULE = '=' * 80
+STATUS_HEADER = ('', RULE, '🚀 AI PERFECTION SYSTEM STATUS', RULE)
+
 class PerfectionSystem:
     """Integrated system for AI perfection"""
     
@@ -33,37 +37,42 @@ class PerfectionSystem:
         self.crawler = UniversalCrawler()
         self.status_file = Config.DATA_DIR / 'perfection_status.json'
     
-    def show_system_status(self):
-        """Display comprehensive system status"""
-        print('\n' + '=' * 80)
-        print('🚀 AI PERFECTION SYSTEM STATUS')
-        print('=' * 80)
+    def format_system_status(self) -> str:
+        """Build the status report as a single string"""
+        out = list(STATUS_HEADER)
         
         # Teacher stats
-        print('\n📚 Multi-Teacher Learning:')
+        out.append('\n📚 Multi-Teacher Learning:')
         teacher_stats = self.multi_teacher.get_teacher_stats()
-        print(f'  Available Teachers: {teacher_stats["available_teachers"]}')
+        out.append(f'  Available Teachers: {teacher_stats["available_teachers"]}')
         for name, info in teacher_stats.get('teachers', {}).items():
             specialties = ', '.join(info['specialties'][:2])
-            print(f'    - {name}: {specialties}... (weight: {info["weight"]:.1%})')
+            out.append(f'    - {name}: {specialties}... (weight: {info["weight"]:.1%})')
         
         # Skill stats
-        print('\n📖 Extended Skills:')
+        out.append('\n📖 Extended Skills:')
         skill_summary = self.skill_manager.get_skills_summary()
         total_skills = sum(s['total'] for s in skill_summary.values())
-        print(f'  Total Skills: {total_skills}')
+        out.append(f'  Total Skills: {total_skills}')
         for category, stats in skill_summary.items():
-            print(f'    {category}: {stats["total"]} skills')
+            out.append(f'    {category}: {stats["total"]} skills')
         
         # Crawl stats
-        print('\n🌐 Knowledge Base:')
+        out.append('\n🌐 Knowledge Base:')
         crawl_stats = self.crawler.get_crawl_stats()
-        print(f'  Total URLs Crawled: {crawl_stats["total_urls"]}')
+        out.append(f'  Total URLs Crawled: {crawl_stats["total_urls"]}')
         if crawl_stats['by_specialty']:
             for specialty, count in crawl_stats['by_specialty'].items():
-                print(f'    {specialty}: {count} URLs')
+                out.append(f'    {specialty}: {count} URLs')
         
-        print('\n' + '=' * 80)
+        out.append('\n' + RULE)
+        return '\n'.join(out) + '\n'
+    
+    def show_system_status(self) -> str:
+        """Display comprehensive system status (one write) and return it"""
+        report = self.format_system_status()
+        sys.stdout.write(report)
+        return report
     
     async def start_learning_cycle(self, specialty: str = None, 
                                    intensity: str = 'normal'):
@@ -86,11 +95,19 @@ class PerfectionSystem:
             await self.crawler.crawl_specialty(specialty, max_pages=max_pages)
         else:
             # Learn from all specialties
-            specialties = list(self.crawler.KNOWLEDGE_SOURCES.keys())
-            for spec in specialties[:3]:  # Start with first 3
-                logger.info(f'📚 Learning {spec}...')
-                await self.crawler.crawl_specialty(spec, max_pages=max_pages // 3)
-                await asyncio.sleep(2)
+            specialties = list(self.crawler.KNOWLEDGE_SOURCES.keys())[:3]  # Start with first 3
+            sem = asyncio.Semaphore(Config.LEARNING_CRAWL_CONCURRENCY)
+
+            async def _learn(spec: str):
+                async with sem:
+                    logger.info(f'📚 Learning {spec}...')
+                    return await self.crawler.crawl_specialty(spec, max_pages=max_pages // len(specialties))
+
+            # Specialties are independent and network-bound: crawl them concurrently
+            results = await asyncio.gather(*(_learn(spec) for spec in specialties), return_exceptions=True)
+            for spec, result in zip(specialties, results):
+                if isinstance(result, Exception):
+                    logger.error(f'Learning {spec} failed: {result}')
         
         print('\n✅ Learning cycle complete')
     
@@ -104,10 +121,14 @@ class PerfectionSystem:
         
         # Use multi-teacher ensemble
         logger.info('🎓 Consulting teacher ensemble...')
-        response, metadata = await self.multi_teacher.generate_ensemble(
-            prompt,
-            task_type=task_type
-        )
+        try:
+            response, metadata = await self.multi_teacher.generate_ensemble(
+                prompt,
+                task_type=task_type
+            )
+        finally:
+            # Release the HTTP session and per-teacher batchers bound to this loop
+            await self.multi_teacher.close_session()
         
         # Update skills
         self.skill_manager.add_skill_experience(
@@ -10,44 +10,98 @@ Usage: sanitized = sanitize(text)
 Status: データ取得・保存時に自動適用
 """
 import re
+try:
+    import hyperscan
+except Exception:
+    hyperscan = None
 
 EMAIL_RE = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
-PHONE_RE = re.compile(r"(?:\+?\d{1,3}[\s-]?)?(?:\d{2,4}[\s-]?){2,4}\d{2,4}")
+# 3-5 digit groups; the digit boundaries stop matches from re-anchoring inside longer digit runs
+_PHONE_CORE = r"(?:\+?\d{1,3}[\s-]?)?\d{2,4}(?:[\s-]?\d{2,4}){2,4}"
+PHONE_RE = re.compile(rf"(?<!\d){_PHONE_CORE}(?!\d)")
 CREDIT_RE = re.compile(r"\b(?:\d[ -]*?){13,16}\b")
 # Japanese-specific patterns
 POSTAL_RE = re.compile(r"〒\s?\d{3}-\d{4}")
 ADDR_KEYWORDS = ["住所", "都", "府", "県", "市", "区", "丁目", "番地", "号"]
+ADDR_RE = re.compile("|".join(map(re.escape, ADDR_KEYWORDS)))
 NAME_SUFFIX_RE = re.compile(r"[\u4e00-\u9faf]{2,4}(?:さん|様|君|氏)")
 
+# All categories folded into one named alternation so detect_pii needs a single scan
+_PII_PATTERNS = (
+    ('email', EMAIL_RE, '[EMAIL_REMOVED]'),
+    ('credit', CREDIT_RE, '[CREDIT_CARD_REMOVED]'),
+    ('phone', PHONE_RE, '[PHONE_REMOVED]'),
+    ('postal', POSTAL_RE, '[POSTAL_REMOVED]'),
+    ('name', NAME_SUFFIX_RE, '[NAME_REMOVED]'),
+)
+PII_UNION = re.compile('|'.join(f'(?P<{name}>{rx.pattern})' for name, rx, _ in _PII_PATTERNS))
+# sanitize keeps sequential passes: later patterns see earlier placeholders, and
+# a one-pass union would let a name swallow an address (東京都太郎さん -> 東[NAME_REMOVED])
+_SANITIZE_PASSES = (
+    (EMAIL_RE, '[EMAIL_REMOVED]'),
+    (CREDIT_RE, '[CREDIT_CARD_REMOVED]'),
+    (PHONE_RE, '[PHONE_REMOVED]'),
+    (POSTAL_RE, '[POSTAL_REMOVED]'),
+    # mask address keywords roughly
+    (ADDR_RE, '[ADDRESS_PART]'),
+    (NAME_SUFFIX_RE, '[NAME_REMOVED]'),
+)
+
+def _build_hyperscan_db():
+    """Compile the PII patterns into a Hyperscan database (None if unavailable)"""
+    if hyperscan is None:
+        return None
+    try:
+        # Hyperscan spells code points as \x{...} rather than Python's \uXXXX
+        # Hyperscan has no lookbehind; for a yes/no scan, consuming boundaries are equivalent
+        overrides = {'phone': rf"(?:^|\D){_PHONE_CORE}(?:\D|$)"}
+        exprs = [
+            re.sub(r"\\u([0-9a-fA-F]{4})", r"\\x{\1}", overrides.get(name, rx.pattern)).encode('utf-8')
+            for name, rx, _ in _PII_PATTERNS
+        ]
+        flag = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+        db = hyperscan.Database()
+        db.compile(expressions=exprs, ids=list(range(len(exprs))),
+                   elements=len(exprs), flags=[flag] * len(exprs))
+        return db
+    except Exception:
+        return None
+
+_HS_DB = _build_hyperscan_db()
+
+def _hyperscan_hit(text: str):
+    """True/False from the Hyperscan database, or None to fall back to re"""
+    found = []
+
+    def on_match(pattern_id, start, end, flags, context):
+        found.append(pattern_id)
+        return True  # stop at the first hit
+
+    try:
+        _HS_DB.scan(text.encode('utf-8'), match_event_handler=on_match)
+    except Exception:
+        if not found:
+            return None
+    return bool(found)
+
 def detect_pii(text: str) -> bool:
     if not text:
         return False
-    if EMAIL_RE.search(text):
-        return True
-    if PHONE_RE.search(text):
-        return True
-    if CREDIT_RE.search(text):
+    hit = _hyperscan_hit(text) if _HS_DB is not None else None
+    if hit is None:
+        hit = PII_UNION.search(text) is not None
+    if hit:
         return True
-    if POSTAL_RE.search(text):
-        return True
-    for kw in ADDR_KEYWORDS:
-        if kw in text and any(ch.isdigit() for ch in text[:200]):
-            return True
-    if NAME_SUFFIX_RE.search(text):
+    if ADDR_RE.search(text) and any(ch.isdigit() for ch in text[:200]):
         return True
     return False
 
 def sanitize(text: str) -> str:
     if not text:
         return text
-    t = EMAIL_RE.sub('[EMAIL_REMOVED]', text)
-    t = CREDIT_RE.sub('[CREDIT_CARD_REMOVED]', t)
-    t = PHONE_RE.sub('[PHONE_REMOVED]', t)
-    t = POSTAL_RE.sub('[POSTAL_REMOVED]', t)
-    # mask address keywords roughly
-    for kw in ADDR_KEYWORDS:
-        t = t.replace(kw, '[ADDRESS_PART]')
-    t = NAME_SUFFIX_RE.sub('[NAME_REMOVED]', t)
+    t = text
+    for rx, repl in _SANITIZE_PASSES:
+        t = rx.sub(repl, t)
     return t
 
 if __name__ == '__main__':
@@ -10,53 +10,134 @@ Usage: reporter = Reporter(); reporter.run_report()
 Status: 各ワーカーサイクル後に自動実行
 """
 import json
+import os
 import time
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from config import Config
-from evaluator import overlap_score, bleu_score, rouge_scores
+from evaluator import score_all
+from src.utils.file_manager import atomic_write_text
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+SCORE_BATCH_SIZE = 256
+REPORT_CACHE_NAME = 'report_cache.json'
+
+def _score_batch(pairs: list) -> tuple:
+    """Score a batch of (ref, hyp) pairs; returns (n, overlap_sum, bleu_sum, rougeL_sum)"""
+    overlap = bleu = rouge_l = 0.0
+    for ref, hyp in pairs:
+        scores = score_all(ref, hyp)
+        overlap += scores['overlap']
+        bleu += scores['bleu']
+        rouge_l += scores['rougeL']
+    return len(pairs), overlap, bleu, rouge_l
+
 class Reporter:
     def __init__(self):
         self.training_dir = Config.TRAINING_DIR
         self.logs_dir = Config.LOGS_DIR
         self.logs_dir.mkdir(exist_ok=True)
 
-    def collect_examples(self):
+    def _iter_file(self, path):
+        # Both parsers take raw bytes, which skips the per-line text decode
+        with open(path, 'rb') as fh:
+            for line in fh:
+                try:
+                    yield _json_loads(line)
+                except ValueError:
+                    continue
+
+    def iter_examples(self):
         files = sorted(self.training_dir.glob('synthetic_*.jsonl'))
-        examples = []
         for f in files:
-            with open(f, 'r', encoding='utf-8') as fh:
-                for line in fh:
-                    try:
-                        examples.append(json.loads(line))
-                    except Exception:
-                        continue
-        return examples
+            yield from self._iter_file(f)
+
+    def collect_examples(self):
+        return list(self.iter_examples())
+
+    def _load_report_cache(self) -> dict:
+        try:
+            with open(self.logs_dir / REPORT_CACHE_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_report_cache(self, cache: dict):
+        atomic_write_text(self.logs_dir / REPORT_CACHE_NAME, json.dumps(cache, separators=(',', ':')))
 
     def run_report(self):
-        examples = self.collect_examples()
-        if not examples:
+        # Per-file sums are cached by (mtime, size); only new or modified files are re-scored
+        cache = self._load_report_cache()
+        fresh_cache = {}
+        batches = []  # (filename, [(ref, hyp), ...]) with at most SCORE_BATCH_SIZE pairs each
+        entries = []
+        if self.training_dir.is_dir():
+            with os.scandir(self.training_dir) as it:
+                entries = sorted(
+                    (e for e in it
+                     if e.name.startswith('synthetic_') and e.name.endswith('.jsonl') and e.is_file()),
+                    key=lambda e: e.name,
+                )
+        for entry in entries:
+            st = entry.stat()
+            cached = cache.get(entry.name)
+            if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+                fresh_cache[entry.name] = cached
+                continue
+
+            seen = 0
+            pairs = []
+            for ex in self._iter_file(entry.path):
+                seen += 1
+                ref = ex.get('output','')
+                # Only examples with a student output are scored; comparing the teacher
+                # output with itself would just inflate every metric to ~1.0
+                hyp = ex.get('student_output')
+                if not ref or not hyp:
+                    continue
+                pairs.append((ref, hyp))
+            fresh_cache[entry.name] = [st.st_mtime, st.st_size, seen, 0, 0.0, 0.0, 0.0]
+            for i in range(0, len(pairs), SCORE_BATCH_SIZE):
+                batches.append((entry.name, pairs[i:i + SCORE_BATCH_SIZE]))
+
+        if len(batches) > 1:
+            # Tokenization/scoring is GIL-bound: spread batches across processes
+            workers = min(len(batches), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                results = list(ex.map(_score_batch, (b for _, b in batches)))
+        else:
+            results = [_score_batch(b) for _, b in batches]
+
+        for (name, _), (count, overlap, bleu, rouge_l) in zip(batches, results):
+            item = fresh_cache[name]
+            item[3] += count
+            item[4] += overlap
+            item[5] += bleu
+            item[6] += rouge_l
+
+        # Dropping entries for deleted files keeps the cache in step with the directory
+        self._save_report_cache(fresh_cache)
+
+        if sum(item[2] for item in fresh_cache.values()) == 0:
             logger.info('No synthetic examples found for reporting')
             return None
 
         stats = {'count': 0, 'overlap': 0.0, 'bleu': 0.0, 'rougeL': 0.0}
         n = 0
-        for ex in examples:
-            ref = ex.get('output','')
-            hyp = ex.get('output','')  # fallback: if student output available, prefer it; synthetic currently uses teacher output
-            # if student output exists, it should be in ex['student_output']
-            if ex.get('student_output'):
-                hyp = ex.get('student_output')
-            if not ref or not hyp:
-                continue
-            n += 1
-            stats['overlap'] += overlap_score(ref, hyp)
-            stats['bleu'] += bleu_score(ref, hyp)
-            stats['rougeL'] += rouge_scores(ref, hyp).get('rougeL', 0.0)
+        for _, _, _, count, overlap, bleu, rouge_l in fresh_cache.values():
+            n += count
+            stats['overlap'] += overlap
+            stats['bleu'] += bleu
+            stats['rougeL'] += rouge_l
 
         if n == 0:
             logger.info('No comparable examples for report')
@@ -10,29 +10,49 @@ Purpose: AI 生成パッチを本番環境に適用する前に安全に検証
 Usage: sandbox.run_checks(patch_code)
 Status: Patch Validator から自動呼び出し
 """
+import hashlib
 import os
+import shelve
 import sys
 import subprocess
 import logging
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from config import Config
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+CHECK_CACHE_FILE = Config.DATA_DIR / 'sandbox_cache.db'
+# Results depend on the interpreter as well as the content
+_CACHE_PREFIX = f'{sys.version_info[0]}.{sys.version_info[1]}'
+
+def _content_key(kind: str, content: str) -> str:
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+    return f'{_CACHE_PREFIX}:{kind}:{digest}'
+
+def _open_check_cache():
+    """Open the persistent syntax/lint cache; falls back to a plain dict if the db is unavailable"""
+    try:
+        return shelve.open(str(CHECK_CACHE_FILE))
+    except Exception as e:
+        logger.warning(f'Sandbox cache unavailable, checking without it: {e}')
+        return {}
+
 def _run(cmd, cwd=None, timeout=30):
-    """Run a shell command and return (returncode, stdout, stderr)"""
+    """Run a command given as an argv list (no shell) and return (returncode, stdout, stderr)"""
     try:
         proc = subprocess.run(
             cmd,
-            shell=True,
             cwd=cwd,
             capture_output=True,
             text=True,
             timeout=timeout
         )
         return proc.returncode, proc.stdout, proc.stderr
+    except FileNotFoundError:
+        return 127, '', f'{cmd[0]}: command not found'
     except subprocess.TimeoutExpired:
         return -1, '', f'Timeout after {timeout} seconds'
     except Exception as e:
@@ -47,30 +67,59 @@ def check_syntax(file_path: str) -> dict:
     except py_compile.PyCompileError as e:
         return {'ok': False, 'error': str(e)}
 
+# Imports every file given on argv in one interpreter and prints {path: error or None} as JSON.
+# Module output is redirected to stderr so stdout carries only the result line.
+_IMPORT_PROBE = """
+import importlib.util, json, os, sys
+results = {}
+real_stdout, sys.stdout = sys.stdout, sys.stderr
+for i, path in enumerate(sys.argv[1:]):
+    sys.path.insert(0, os.path.dirname(path))
+    try:
+        spec = importlib.util.spec_from_file_location(f'test_module_{i}', path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        results[path] = None
+    except BaseException as e:
+        results[path] = f'Import ERROR: {e}'
+    finally:
+        sys.path.pop(0)
+real_stdout.write(json.dumps(results))
+"""
+
+def check_imports_batch(file_paths: list) -> dict:
+    """Import-check several files in a single child interpreter; returns {path: result}"""
+    if not file_paths:
+        return {}
+    import json
+    proc = None
+    try:
+        proc = subprocess.run(
+            [sys.executable, '-c', _IMPORT_PROBE, *file_paths],
+            capture_output=True,
+            text=True,
+            timeout=30 + 5 * len(file_paths)
+        )
+        errors = json.loads(proc.stdout)
+    except subprocess.TimeoutExpired:
+        return {p: {'ok': False, 'error': 'Import check timed out'} for p in file_paths}
+    except Exception as e:
+        detail = (proc.stdout + proc.stderr) if proc is not None else str(e)
+        return {p: {'ok': False, 'error': detail} for p in file_paths}
+
+    results = {}
+    for p in file_paths:
+        err = errors.get(p)
+        results[p] = {'ok': True, 'message': 'Imports OK'} if err is None else {'ok': False, 'error': err}
+    return results
+
 def check_imports(file_path: str) -> dict:
     """Try to import the module to check for missing dependencies"""
-    code = f"""
-import sys
-sys.path.insert(0, '{os.path.dirname(file_path)}')
-try:
-    import importlib.util
-    spec = importlib.util.spec_from_file_location('test_module', '{file_path}')
-    mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)
-    print('Import OK')
-except Exception as e:
-    print(f'Import ERROR: {{e}}')
-    sys.exit(1)
-"""
-    ret, out, err = _run(f'python3 -c "{code}"')
-    if ret == 0:
-        return {'ok': True, 'message': 'Imports OK'}
-    else:
-        return {'ok': False, 'error': out + err}
+    return check_imports_batch([file_path])[file_path]
 
 def check_linting(file_path: str) -> dict:
     """Run flake8 linting if available"""
-    ret, out, err = _run(f'flake8 {file_path} --max-line-length=120')
+    ret, out, err = _run(['flake8', file_path, '--max-line-length=120'])
     if ret == 0:
         return {'ok': True, 'message': 'Flake8 OK'}
     elif 'not found' in err or 'not found' in out:
@@ -85,7 +134,7 @@ def run_unit_tests(test_file: str = None) -> dict:
     if not Path(test_file).exists():
         return {'ok': True, 'message': 'No test file/dir found (skipped)', 'skipped': True}
     
-    ret, out, err = _run(f'pytest {test_file} -v --tb=short', timeout=60)
+    ret, out, err = _run(['pytest', str(test_file), '-v', '--tb=short'], timeout=60)
     if ret == 0:
         return {'ok': True, 'message': 'Tests passed', 'output': out}
     elif 'not found' in err.lower():
@@ -109,40 +158,79 @@ def validate_patch(files: dict) -> dict:
     
     # create temp dir to check syntax
     with tempfile.TemporaryDirectory() as tmpdir:
+        # Write every file first so import checks can see sibling modules from the same patch
+        paths = []
         for file_path, content in files.items():
             full_path = Path(tmpdir) / file_path
             full_path.parent.mkdir(parents=True, exist_ok=True)
             full_path.write_text(content, encoding='utf-8')
-            
-            results['files'][file_path] = {}
+            paths.append(str(full_path))
+
+        entries = [{} for _ in paths]
+        contents = list(files.values())
+        cache = _open_check_cache()
+        try:
+            # syntax (in-process, cheap); identical content is not recompiled
+            importable = []
+            for p, content, entry in zip(paths, contents, entries):
+                key = _content_key('syntax', content)
+                syn = cache.get(key)
+                if syn is None:
+                    syn = check_syntax(p)
+                    cache[key] = syn
+                entry['syntax'] = syn
+                if syn['ok']:
+                    importable.append(p)
+                else:
+                    entry['status'] = 'FAILED'
+
+            # imports: one child interpreter for the whole patch instead of one per file.
+            # Not cached: the result depends on sibling files and installed packages.
+            imports = check_imports_batch(importable)
+            lintable = []
+            for p, content, entry in zip(paths, contents, entries):
+                if p not in imports:
+                    continue
+                entry['imports'] = imports[p]
+                if imports[p]['ok']:
+                    lintable.append((p, content, entry))
+                else:
+                    entry['status'] = 'FAILED'
+
+            # linting (non-critical); only content not linted before goes to flake8
+            to_lint = []
+            for p, content, entry in lintable:
+                lint = cache.get(_content_key('lint', content))
+                if lint is None:
+                    to_lint.append((p, content, entry))
+                else:
+                    entry['linting'] = lint
+                    entry['status'] = 'PASSED'
+
+            # flake8 runs are subprocess-bound, so threads are enough
+            if len(to_lint) > 1:
+                workers = min(8, len(to_lint), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as ex:
+                    lints = list(ex.map(check_linting, (p for p, _, _ in to_lint)))
+            else:
+                lints = [check_linting(p) for p, _, _ in to_lint]
+            for (_, content, entry), lint in zip(to_lint, lints):
+                entry['linting'] = lint
+                entry['status'] = 'PASSED'
+                if not lint.get('skipped'):
+                    cache[_content_key('lint', content)] = lint
+        finally:
+            if hasattr(cache, 'close'):
+                cache.close()
+
+        for file_path, entry in zip(files, entries):
+            results['files'][file_path] = entry
             results['summary']['total'] += 1
-            
-            # syntax
-            syn = check_syntax(str(full_path))
-            results['files'][file_path]['syntax'] = syn
-            
-            if not syn['ok']:
-                results['files'][file_path]['status'] = 'FAILED'
-                results['summary']['failed'] += 1
-                results['overall_ok'] = False
-                continue
-            
-            # imports
-            imp = check_imports(str(full_path))
-            results['files'][file_path]['imports'] = imp
-            
-            if not imp['ok']:
-                results['files'][file_path]['status'] = 'FAILED'
+            if entry['status'] == 'PASSED':
+                results['summary']['passed'] += 1
+            else:
                 results['summary']['failed'] += 1
                 results['overall_ok'] = False
-                continue
-            
-            # linting (non-critical)
-            lint = check_linting(str(full_path))
-            results['files'][file_path]['linting'] = lint
-            
-            results['files'][file_path]['status'] = 'PASSED'
-            results['summary']['passed'] += 1
     
     return results
 
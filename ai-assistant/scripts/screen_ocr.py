@@ -8,16 +8,23 @@ Requires:
 - opencv-python
 - pillow
 - requests
+- rapidfuzz (optional; faster dedup similarity)
+- tesserocr (optional; keeps one in-process tesseract instead of a fork per capture)
+- mss (optional; native framebuffer grabs instead of pyautogui screenshots)
+- orjson (optional; faster parsing of the streamed Ollama frames)
 """
 from __future__ import annotations
 
 import argparse
 import json
+import multiprocessing
+import queue
 import threading
 import time
 import difflib
 import hashlib
 import sys
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Tuple, List
@@ -28,6 +35,27 @@ import pyautogui
 import pytesseract
 import requests
 
+try:
+    from rapidfuzz import fuzz
+except Exception:
+    fuzz = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except Exception:
+    _json_loads = json.loads
+
+try:
+    import mss
+except Exception:
+    mss = None
+
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+except Exception:
+    PyTessBaseAPI = None
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -36,30 +64,237 @@ if str(PROJECT_ROOT) not in sys.path:
 
 Region = Optional[Tuple[int, int, int, int]]  # (left, top, width, height)
 
+OCR_CACHE_SIZE = 128
+MIN_CONTRAST = 32  # max - min gray level below which a frame is treated as blank
+DEFAULT_OCR_MAX_HEIGHT = 1600  # px; taller (HiDPI) frames are downscaled before OCR
+MAX_IDLE_INTERVAL = 30.0  # seconds; polling backs off up to this while the screen is static
+
+
+def _frame_buffer(out: Optional[np.ndarray], height: int, width: int) -> np.ndarray:
+    if out is None or out.shape != (height, width):
+        return np.empty((height, width), dtype=np.uint8)
+    return out
+
+
+def _apply_threshold(gray: np.ndarray, threshold: int, out: np.ndarray) -> bool:
+    """Binarize `gray` into `out`; returns False when the frame has no usable contrast.
+
+    threshold > 0 is a fixed level. threshold <= 0 picks the level per frame with
+    Otsu's method, which follows dark mode / video luminance shifts. Otsu always
+    splits a frame somewhere between its own darkest and brightest pixel, so a
+    (near-)uniform frame, dark or light, is detected by its gray-level spread and
+    skipped, since it would only give tesseract noise.
+    """
+    if threshold > 0:
+        cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY, dst=out)
+        return True
+    # Measured before thresholding: `out` may be the same buffer as `gray`
+    lo, hi, _, _ = cv2.minMaxLoc(gray)
+    cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU, dst=out)
+    return hi - lo >= MIN_CONTRAST
+
+
+def _binarize(screenshot, threshold: int, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, bool]:
+    """Grayscale + binary threshold using a single 1-byte-per-pixel buffer.
+
+    `out` is reused when it already has the right shape, so a capture loop
+    does not allocate a new frame per tick. Returns (frame, has_contrast).
+    """
+    # PIL converts RGB->L in C with the same luma weights as cv2.COLOR_RGB2GRAY,
+    # so no 3-channel numpy copy is made; the threshold writes straight into `out`.
+    gray = screenshot.convert("L")
+    out = _frame_buffer(out, gray.height, gray.width)
+    return out, _apply_threshold(np.asarray(gray), threshold, out)
+
+
+def _binarize_bgra(frame: np.ndarray, threshold: int, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, bool]:
+    """Same as _binarize for a raw BGRA framebuffer (as returned by mss)."""
+    out = _frame_buffer(out, frame.shape[0], frame.shape[1])
+    cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY, dst=out)
+    return out, _apply_threshold(out, threshold, out)
+
+
+def _mss_monitor(sct, region: Region) -> dict:
+    if region is None:
+        return sct.monitors[1]  # primary monitor, like pyautogui's default
+    left, top, width, height = region
+    return {"left": left, "top": top, "width": width, "height": height}
+
+
+def _mss_frame(sct, monitor: dict) -> np.ndarray:
+    shot = sct.grab(monitor)
+    return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+
+def _longest_overlap(tail: List[str], new_lines: List[str]) -> int:
+    """Length of the longest suffix of `tail` that is a prefix of `new_lines`.
+
+    KMP prefix function over new_lines + [sentinel] + tail: O(len(new) + len(tail))
+    line comparisons instead of re-slicing and comparing for every candidate length.
+    """
+    seq: list = [*new_lines, None, *tail]  # None never equals a line, so matches stop at the border
+    pi = [0] * len(seq)
+    for i in range(1, len(seq)):
+        j = pi[i - 1]
+        while j and seq[i] != seq[j]:
+            j = pi[j - 1]
+        if seq[i] == seq[j]:
+            j += 1
+        pi[i] = j
+    return pi[-1] if tail else 0
+
+
+def _downscale(image: np.ndarray, max_height: int) -> np.ndarray:
+    """Shrink frames taller than max_height (<= 0 disables); tesseract time scales with pixels."""
+    height = image.shape[0]
+    if max_height <= 0 or height <= max_height:
+        return image
+    scale = max_height / height
+    return cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+def _tess_read(api, image: np.ndarray) -> str:
+    # Hand the 8-bit frame buffer to tesseract directly (no PIL image in between)
+    height, width = image.shape
+    api.SetImageBytes(image.tobytes(), width, height, 1, width)
+    return api.GetUTF8Text()
+
+
+_ONCE_API = None
+
+
+def _ocr_once(image: np.ndarray, lang: str, max_height: int = DEFAULT_OCR_MAX_HEIGHT) -> str:
+    """OCR for run_once: one lazily created tesseract per language for the process."""
+    global _ONCE_API
+    image = _downscale(image, max_height)
+    if PyTessBaseAPI is not None:
+        try:
+            if _ONCE_API is None or _ONCE_API[0] != lang:
+                if _ONCE_API is not None:
+                    _ONCE_API[1].End()
+                _ONCE_API = (lang, PyTessBaseAPI(lang=lang, psm=PSM.AUTO))
+            return _tess_read(_ONCE_API[1], image)
+        except Exception:
+            _ONCE_API = None
+    return pytesseract.image_to_string(image, lang=lang)
+
+
+def _frame_digest(thresh: np.ndarray) -> bytes:
+    # Exact digest of the binarized pixels: hashing is ~1ms, tesseract is 50ms+
+    return hashlib.blake2b(thresh, digest_size=16).digest()
+
 
 @dataclass
 class AdvancedScreenOCR:
     interval: float = 2.0
     region: Region = None
     lang: str = "jpn"
-    threshold: int = 180
+    threshold: int = 0  # <= 0: Otsu per frame
     similarity: float = 0.8
+    ocr_max_height: int = DEFAULT_OCR_MAX_HEIGHT
     running: bool = False
     thread: Optional[threading.Thread] = None
     pages: List[str] = field(default_factory=list)
     full_lines: List[str] = field(default_factory=list)
+    _api: object = field(default=None, init=False, repr=False)
+    _api_failed: bool = field(default=False, init=False, repr=False)
+    _sct: object = field(default=None, init=False, repr=False)
+    _monitor: Optional[dict] = field(default=None, init=False, repr=False)
+    _frame: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    use_process: bool = False
+    _last_frame: bytes = field(default=b"", init=False, repr=False)
+    _backoff: float = field(default=1.0, init=False, repr=False)
+    _wake: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    _ocr_cache: "OrderedDict[bytes, str]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _proc: Optional[multiprocessing.Process] = field(default=None, init=False, repr=False)
+    _results: object = field(default=None, init=False, repr=False)
+    _stop_event: object = field(default=None, init=False, repr=False)
+
+    def _ocr(self, image: np.ndarray) -> str:
+        image = _downscale(image, self.ocr_max_height)
+        # A persistent tesseract instance loads the language data once, not on every capture
+        if PyTessBaseAPI is not None and not self._api_failed:
+            try:
+                if self._api is None:
+                    self._api = PyTessBaseAPI(lang=self.lang, psm=PSM.AUTO)
+                return _tess_read(self._api, image)
+            except Exception:
+                self._api_failed = True
+                self._close_api()
+        return pytesseract.image_to_string(image, lang=self.lang)
+
+    def _close_api(self) -> None:
+        if self._api is not None:
+            try:
+                self._api.End()
+            except Exception:
+                pass
+            self._api = None
+
+    def _grab(self) -> Optional[np.ndarray]:
+        """Binarized frame, or None when it has no usable contrast (nothing to read)."""
+        if mss is not None:
+            # Created lazily so the grabber belongs to the capturing thread/process
+            if self._sct is None:
+                self._sct = mss.mss()
+                self._monitor = _mss_monitor(self._sct, self.region)
+            self._frame, has_contrast = _binarize_bgra(
+                _mss_frame(self._sct, self._monitor), self.threshold, self._frame
+            )
+        else:
+            # The frame is only read within one tick (digest + OCR), so one buffer is reused
+            screenshot = pyautogui.screenshot(region=self.region)
+            self._frame, has_contrast = _binarize(screenshot, self.threshold, self._frame)
+        return self._frame if has_contrast else None
+
+    def _release(self) -> None:
+        self._close_api()
+        if self._sct is not None:
+            try:
+                self._sct.close()
+            except Exception:
+                pass
+            self._sct = None
 
     def _capture_text(self) -> str:
-        screenshot = pyautogui.screenshot(region=self.region)
-        img = np.array(screenshot)
-        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-        _, thresh = cv2.threshold(gray, self.threshold, 255, cv2.THRESH_BINARY)
-        text = pytesseract.image_to_string(thresh, lang=self.lang)
-        return text.strip()
+        thresh = self._grab()
+        if thresh is None:
+            return ""
+        return self._read(thresh, _frame_digest(thresh))
+
+    def _frame_changed(self, thresh: np.ndarray) -> bool:
+        digest = _frame_digest(thresh)
+        if digest == self._last_frame:
+            return False
+        self._last_frame = digest
+        return True
+
+    def _read(self, thresh: np.ndarray, digest: bytes) -> str:
+        # Screens often flip back to a state already seen (tab/window switches): reuse its text
+        text = self._ocr_cache.get(digest)
+        if text is not None:
+            self._ocr_cache.move_to_end(digest)
+            return text
+        text = self._ocr(thresh).strip()
+        self._ocr_cache[digest] = text
+        if len(self._ocr_cache) > OCR_CACHE_SIZE:
+            self._ocr_cache.popitem(last=False)
+        return text
 
     def _is_similar(self, text1: str, text2: str) -> bool:
-        ratio = difflib.SequenceMatcher(None, text1, text2).ratio()
-        return ratio >= self.similarity
+        total = len(text1) + len(text2)
+        if total == 0:
+            return True
+        # Both measures are 2*matches/total, so 2*min(len)/total is an upper bound:
+        # texts whose lengths differ too much cannot reach the threshold
+        if 2 * min(len(text1), len(text2)) < self.similarity * total:
+            return False
+        if fuzz is not None:
+            # Normalized indel similarity (close to SequenceMatcher.ratio), computed in C++;
+            # score_cutoff lets it stop as soon as the threshold is out of reach
+            cutoff = self.similarity * 100.0
+            return fuzz.ratio(text1, text2, score_cutoff=cutoff) >= cutoff
+        return difflib.SequenceMatcher(None, text1, text2).ratio() >= self.similarity
 
     def _merge_lines(self, new_text: str) -> None:
         new_lines = [l.strip() for l in new_text.split("\n") if l.strip()]
@@ -68,57 +303,193 @@ class AdvancedScreenOCR:
         if not self.full_lines:
             self.full_lines.extend(new_lines)
             return
-        overlap_index = 0
-        for i in range(len(self.full_lines)):
-            tail = self.full_lines[i:]
-            if tail == new_lines[: len(tail)]:
-                overlap_index = len(tail)
+        # Only the last len(new_lines) lines can overlap; take the longest suffix/prefix match
+        k = min(len(self.full_lines), len(new_lines))
+        overlap_index = _longest_overlap(self.full_lines[-k:], new_lines)
         self.full_lines.extend(new_lines[overlap_index:])
 
+    def _tick(self, previous_text: str) -> str:
+        """Capture once and merge new lines; returns the text to compare the next capture with."""
+        thresh = self._grab()
+        if thresh is None or not self._frame_changed(thresh):
+            # Blank or static screen: nothing new to read, skip tesseract and the dedup check
+            self._backoff = min(self._backoff * 2, 1024.0)
+            return previous_text
+        self._backoff = 1.0
+        current_text = self._read(thresh, self._last_frame)
+        if current_text:
+            self.pages.append(current_text)
+            if not self._is_similar(previous_text, current_text):
+                self._merge_lines(current_text)
+                return current_text
+        return previous_text
+
     def _loop(self) -> None:
         previous_text = ""
         while self.running:
-            current_text = self._capture_text()
-            if current_text:
-                self.pages.append(current_text)
-                if not self._is_similar(previous_text, current_text):
-                    self._merge_lines(current_text)
-                    previous_text = current_text
-            time.sleep(self.interval)
+            previous_text = self._tick(previous_text)
+            # Event wait instead of sleep so stop() does not wait out a long idle back-off
+            self._wake.wait(self._poll_delay())
+
+    def _poll_delay(self) -> float:
+        """Sleep before the next capture: `interval`, doubling per idle tick up to MAX_IDLE_INTERVAL."""
+        return min(self.interval * self._backoff, max(self.interval, MAX_IDLE_INTERVAL))
+
+    def _worker_config(self) -> dict:
+        return {
+            "interval": self.interval,
+            "region": self.region,
+            "lang": self.lang,
+            "threshold": self.threshold,
+            "similarity": self.similarity,
+            "ocr_max_height": self.ocr_max_height,
+        }
 
     def start(self) -> None:
-        if not self.running:
-            self.running = True
+        if self.running:
+            return
+        self.running = True
+        if self.use_process:
+            # Capture/threshold/OCR/dedup run on their own core, away from the caller's GIL
+            ctx = multiprocessing.get_context("spawn")
+            self._results = ctx.Queue()
+            self._stop_event = ctx.Event()
+            self._proc = ctx.Process(
+                target=_ocr_worker,
+                args=(self._worker_config(), self._results, self._stop_event),
+                daemon=True,
+            )
+            self._proc.start()
+        else:
+            self._wake.clear()
             self.thread = threading.Thread(target=self._loop, daemon=True)
             self.thread.start()
 
     def stop(self) -> None:
         self.running = False
+        self._wake.set()
+        if self._proc is not None:
+            self._stop_event.set()
+            # Drain before joining: a child blocked flushing a full queue never exits
+            deadline = time.monotonic() + max(2.0, self.interval + 1)
+            while self._proc.is_alive() and time.monotonic() < deadline:
+                try:
+                    self.full_lines.extend(self._results.get(timeout=0.1))
+                except queue.Empty:
+                    pass
+            self._drain()
+            self._proc.join(timeout=0.5)
+            if self._proc.is_alive():
+                self._proc.terminate()
+                self._proc.join(timeout=0.5)
+            self._proc = None
         if self.thread:
             self.thread.join(timeout=2)
+            if not self.thread.is_alive():
+                self._release()
+
+    def _drain(self) -> None:
+        """Move lines merged by the worker process into full_lines (non-blocking)."""
+        if self._results is None:
+            return
+        while True:
+            try:
+                self.full_lines.extend(self._results.get_nowait())
+            except queue.Empty:
+                break
 
     def get_full_text(self) -> str:
+        self._drain()
         return "\n".join(self.full_lines)
 
     def clear(self) -> None:
         self.pages = []
         self.full_lines = []
+        self._last_frame = b""
+        self._backoff = 1.0
 
 
-def summarize_with_ollama_stream(text: str, model: str, url: str) -> None:
+def _ocr_worker(config: dict, results, stop_event) -> None:
+    """Process entry point: run the capture loop and push newly merged lines to `results`."""
+    ocr = AdvancedScreenOCR(**config)
+    previous_text = ""
+    sent = 0
+    try:
+        while not stop_event.is_set():
+            previous_text = ocr._tick(previous_text)
+            if len(ocr.full_lines) > sent:
+                results.put(ocr.full_lines[sent:])
+                sent = len(ocr.full_lines)
+            stop_event.wait(ocr._poll_delay())
+    finally:
+        ocr._release()
+
+
+def _iter_ndjson(response):
+    """Parse a streamed NDJSON body, splitting raw chunks on b"\n" (no per-line decode)."""
+    pending = b""
+    for chunk in response.iter_content(chunk_size=None):
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _json_loads(line)
+    if pending.strip():
+        yield _json_loads(pending)
+
+
+_SESSION: Optional[requests.Session] = None
+
+
+def _ollama_session() -> requests.Session:
+    """Process-wide keep-alive session for Ollama calls (one host, one request at a time)."""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        _SESSION.mount("http://", adapter)
+        _SESSION.mount("https://", adapter)
+    return _SESSION
+
+
+def summarize_with_ollama_stream(
+    text: str,
+    model: str,
+    url: str,
+    session: Optional[requests.Session] = None,
+    context: Optional[List[int]] = None,
+    keep_alive: Optional[str] = None,
+) -> Optional[List[int]]:
+    """Stream a summary to stdout; returns the `context` from the final frame.
+
+    Passing that context back on the next call lets Ollama continue from the
+    already-processed conversation instead of prefilling it again, and
+    `keep_alive` keeps the model loaded between periodic summaries.
+    """
     payload = {
         "model": model,
         "prompt": f"以下を要約:\n{text}",
         "stream": True,
     }
-    with requests.post(url, json=payload, stream=True, timeout=120) as r:
+    if context:
+        payload["context"] = context
+    if keep_alive:
+        payload["keep_alive"] = keep_alive
+    # A shared Session keeps the connection alive between periodic summaries
+    http = session if session is not None else _ollama_session()
+    new_context = None
+    with http.post(url, json=payload, stream=True, timeout=120) as r:
         r.raise_for_status()
-        for line in r.iter_lines():
-            if not line:
-                continue
-            data = json.loads(line)
-            print(data.get("response", ""), end="", flush=True)
+        write, flush = sys.stdout.write, sys.stdout.flush
+        for data in _iter_ndjson(r):
+            piece = data.get("response")
+            if piece:
+                write(piece)
+                flush()
+            if data.get("done"):
+                new_context = data.get("context")
     print()
+    return new_context
 
 
 def learn_from_text(text: str, rebuild: bool = False) -> dict:
@@ -136,7 +507,8 @@ def learn_from_text(text: str, rebuild: bool = False) -> dict:
         clean_dir = Config.DATA_DIR / "clean"
         clean_dir.mkdir(parents=True, exist_ok=True)
 
-        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        # Only needs to be a stable content address; blake2b is faster than sha256 in software
+        digest = hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
         out = clean_dir / f"screen_{digest}.txt"
 
         if out.exists():
@@ -160,13 +532,16 @@ def parse_region(raw: Optional[str]) -> Region:
     return parts[0], parts[1], parts[2], parts[3]
 
 
-def run_once(region: Region, lang: str, threshold: int) -> str:
-    screenshot = pyautogui.screenshot(region=region)
-    img = np.array(screenshot)
-    gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
-    _, thresh = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
-    text = pytesseract.image_to_string(thresh, lang=lang)
-    return text.strip()
+def run_once(region: Region, lang: str, threshold: int, ocr_max_height: int = DEFAULT_OCR_MAX_HEIGHT) -> str:
+    if mss is not None:
+        with mss.mss() as sct:
+            thresh, has_contrast = _binarize_bgra(_mss_frame(sct, _mss_monitor(sct, region)), threshold)
+    else:
+        screenshot = pyautogui.screenshot(region=region)
+        thresh, has_contrast = _binarize(screenshot, threshold)
+    if not has_contrast:
+        return ""
+    return _ocr_once(thresh, lang, ocr_max_height).strip()
 
 
 def main() -> None:
@@ -174,10 +549,25 @@ def main() -> None:
     parser.add_argument("--region", help="left,top,width,height", default=None)
     parser.add_argument("--lang", default="jpn", help="tesseract language code")
     parser.add_argument("--interval", type=float, default=2.0)
-    parser.add_argument("--threshold", type=int, default=180)
+    parser.add_argument("--threshold", type=int, default=0,
+                        help="fixed binarization level (1-255); 0 = Otsu per frame. "
+                             "The default changed from 180 to 0; pass --threshold 180 for the old behaviour")
     parser.add_argument("--similarity", type=float, default=0.8)
+    parser.add_argument("--ocr-max-height", type=int, default=DEFAULT_OCR_MAX_HEIGHT,
+                        help="downscale taller captures to this height before OCR (0 = never)")
     parser.add_argument("--once", action="store_true", help="single capture")
+    parser.add_argument("--process", action="store_true",
+                        help="run the capture loop in a separate process")
     parser.add_argument("--summary", action="store_true", help="summarize via Ollama")
+    parser.add_argument("--summary-min-lines", type=int, default=3,
+                        help="new lines required before summarizing again")
+    parser.add_argument("--summary-max-gap", type=float, default=30.0,
+                        help="summarize any pending new lines after this many seconds")
+    parser.add_argument("--summary-min-chars", type=int, default=400,
+                        help="new characters that trigger a summary regardless of line count")
+    parser.add_argument("--summary-context-max", type=int, default=2048,
+                        help="start a fresh summary context once the carried one has this many tokens (0 = never)")
+    parser.add_argument("--keep-alive", default="10m", help="how long Ollama keeps the model loaded")
     parser.add_argument("--learn", action="store_true", help="save OCR text to learning corpus")
     parser.add_argument("--learn-rebuild", action="store_true", help="rebuild vector store after learning")
     parser.add_argument("--learn-min-chars", type=int, default=40, help="minimum chars required to learn")
@@ -188,7 +578,9 @@ def main() -> None:
     region = parse_region(args.region)
 
     if args.once:
-        text = run_once(region=region, lang=args.lang, threshold=args.threshold)
+        text = run_once(
+            region=region, lang=args.lang, threshold=args.threshold, ocr_max_height=args.ocr_max_height
+        )
         print(text)
         if args.summary and text:
             summarize_with_ollama_stream(text, model=args.model, url=args.ollama_url)
@@ -203,8 +595,15 @@ def main() -> None:
         lang=args.lang,
         threshold=args.threshold,
         similarity=args.similarity,
+        ocr_max_height=args.ocr_max_height,
+        use_process=args.process,
     )
     ocr.start()
+    # Only lines added since the last summary are sent, so each summary costs
+    # O(new text) instead of O(whole session)
+    summarized_lines = 0
+    last_summary_at = time.monotonic()
+    summary_context = None
     try:
         while True:
             time.sleep(args.interval)
@@ -212,7 +611,30 @@ def main() -> None:
             if text:
                 print(text)
                 if args.summary:
-                    summarize_with_ollama_stream(text, model=args.model, url=args.ollama_url)
+                    new_lines = ocr.full_lines[summarized_lines:]
+                    new_text = "\n".join(new_lines)
+                    overdue = time.monotonic() - last_summary_at >= args.summary_max_gap
+                    if (
+                        len(new_lines) >= args.summary_min_lines
+                        or len(new_text) >= args.summary_min_chars
+                        or (new_lines and overdue)
+                    ):
+                        summary_context = summarize_with_ollama_stream(
+                            new_text,
+                            model=args.model,
+                            url=args.ollama_url,
+                            context=summary_context,
+                            keep_alive=args.keep_alive,
+                        ) or summary_context
+                        if (
+                            summary_context
+                            and args.summary_context_max
+                            and len(summary_context) > args.summary_context_max
+                        ):
+                            # The context holds every prior token; drop it before it outgrows the model window
+                            summary_context = None
+                        summarized_lines += len(new_lines)
+                        last_summary_at = time.monotonic()
                 print("=" * 40)
     except KeyboardInterrupt:
         ocr.stop()
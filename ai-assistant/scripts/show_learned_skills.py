@@ -4,11 +4,19 @@ Usage: python3 scripts/show_learned_skills.py [YYYY-MM-DD]
 If date omitted, shows all learned skills (and timestamps if available).
 """
 import sys
+from bisect import bisect_left
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import json
 from config import Config
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 def parse_ts(val):
     try:
@@ -20,17 +28,33 @@ def parse_ts(val):
             return None
 
 
+TS_KEYS = ('learned_at', 'added_at', 'timestamp', 'time')
+
+
+def _skill_ts(s):
+    if isinstance(s, dict):
+        for k in TS_KEYS:
+            if k in s:
+                return parse_ts(s.get(k))
+    return None
+
+
+@lru_cache(maxsize=4)
+def _load_skills(path: str, mtime_ns: int):
+    """(skills, sorted timestamps, skill index per timestamp); cached per file version"""
+    mem = _json_loads(Path(path).read_bytes())
+    skills = mem.get('learned_skills', []) if isinstance(mem, dict) else []
+    stamped = sorted((ts, i) for i, ts in ((i, _skill_ts(s)) for i, s in enumerate(skills)) if ts)
+    return skills, [ts for ts, _ in stamped], [i for _, i in stamped]
+
+
 def show_for_date(d=None):
-    mem = {}
     mf = Config.MEMORY_FILE
     if not mf.exists():
         print('メモリファイルが存在しません:', mf)
         return
 
-    with open(mf, 'r', encoding='utf-8') as f:
-        mem = json.load(f)
-
-    skills = mem.get('learned_skills', []) if isinstance(mem, dict) else []
+    skills, ts_sorted, ts_index = _load_skills(str(mf), mf.stat().st_mtime_ns)
     if d is None:
         print(f'学習済スキル（合計 {len(skills)} 件）:')
         for s in skills:
@@ -39,16 +63,10 @@ def show_for_date(d=None):
 
     start_ts = datetime.combine(d, datetime.min.time()).timestamp()
     end_ts = start_ts + 86400
-    filtered = []
-    for s in skills:
-        ts = None
-        if isinstance(s, dict):
-            for k in ('learned_at', 'added_at', 'timestamp', 'time'):
-                if k in s:
-                    ts = parse_ts(s.get(k))
-                    break
-        if ts and start_ts <= ts < end_ts:
-            filtered.append(s)
+    # Timestamps are parsed once per file version; a date is two binary searches
+    lo = bisect_left(ts_sorted, start_ts)
+    hi = bisect_left(ts_sorted, end_ts)
+    filtered = [skills[i] for i in sorted(ts_index[lo:hi])]
 
     print(f'{d.isoformat()} に学習したスキル: {len(filtered)} 件')
     for s in filtered:
@@ -1,8 +1,61 @@
 #!/usr/bin/env python3
 """Show aggregate summary across all available daily summaries."""
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from config import Config
+from src.utils.file_manager import atomic_write_bytes
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+# Per-file contributions, reused while a summary's (mtime, size) is unchanged.
+# Kept outside summaries/ so the *.json globs there only ever see daily summaries.
+ROLLUP_FILE = Config.DATA_DIR / 'summaries_rollup.json'
+
+_FIELDS = (
+    ('datasets', 'new_datasets'),
+    ('examples', 'new_examples'),
+    ('documents', 'new_indexed_documents'),
+    ('patches', 'approved_patches'),
+    ('skills', 'learned_skills_count'),
+)
+
+
+def _load_summary(f: Path):
+    try:
+        return _json_loads(f.read_bytes())
+    except Exception:
+        return None
+
+
+def _contribution(f: Path, s):
+    """[date, [counts...]] for one summary, or None if it cannot be used"""
+    if s is None:
+        return None
+    try:
+        return [s.get('date') or f.stem, [int(s.get(src, 0) or 0) for _, src in _FIELDS]]
+    except Exception:
+        return None
+
+
+def _load_rollup() -> dict:
+    try:
+        return _json_loads(ROLLUP_FILE.read_bytes()).get('files', {})
+    except Exception:
+        return {}
+
+
+def _save_rollup(entries: dict) -> None:
+    atomic_write_bytes(ROLLUP_FILE, _json_dumps({'files': entries}))
 
 
 def main():
@@ -16,27 +69,39 @@ def main():
         print("❌ サマリファイルがありません")
         return
 
-    totals = {
-        'datasets': 0,
-        'examples': 0,
-        'documents': 0,
-        'patches': 0,
-        'skills': 0,
-    }
-    dates = []
-
+    rollup = _load_rollup()
+    entries = {}
+    stale = []
     for f in files:
+        st = f.stat()
+        cached = rollup.get(f.name)
+        if cached and cached['mtime'] == st.st_mtime and cached['size'] == st.st_size:
+            entries[f.name] = cached
+        else:
+            stale.append((f, st))
+
+    if stale:
+        # Reads are I/O-bound, so threads overlap them; results come back in file order
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            loaded = list(ex.map(_load_summary, (f for f, _ in stale)))
+        for (f, st), s in zip(stale, loaded):
+            entries[f.name] = {'mtime': st.st_mtime, 'size': st.st_size, 'summary': _contribution(f, s)}
+    if stale or len(entries) != len(rollup):
         try:
-            with open(f, 'r', encoding='utf-8') as fh:
-                s = json.load(fh)
-            dates.append(s.get('date') or f.stem)
-            totals['datasets'] += int(s.get('new_datasets', 0) or 0)
-            totals['examples'] += int(s.get('new_examples', 0) or 0)
-            totals['documents'] += int(s.get('new_indexed_documents', 0) or 0)
-            totals['patches'] += int(s.get('approved_patches', 0) or 0)
-            totals['skills'] += int(s.get('learned_skills_count', 0) or 0)
-        except Exception:
+            _save_rollup(entries)
+        except OSError:
+            pass
+
+    totals = {name: 0 for name, _ in _FIELDS}
+    dates = []
+    for f in files:
+        contribution = entries[f.name]['summary']
+        if contribution is None:
             continue
+        date, counts = contribution
+        dates.append(date)
+        for (name, _), count in zip(_FIELDS, counts):
+            totals[name] += count
 
     start_date = dates[0] if dates else '----'
     end_date = dates[-1] if dates else '----'
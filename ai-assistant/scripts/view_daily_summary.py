@@ -2,43 +2,53 @@
 """Quick view of today's or latest daily summary in a readable format"""
 import sys
 import json
+from collections import ChainMap
 from pathlib import Path
 from datetime import date, datetime
 from config import Config
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+_SUMMARY_TEMPLATE = (
+    "📅 {date}\n"
+    + "─" * 60 + "\n"
+    "📚 新規データセット: {new_datasets} 件\n"
+    "📊 学習例追加: {new_examples} 件\n"
+    "🗂️  新規インデックスドキュメント: {new_indexed_documents} 件\n"
+    "💾 インデックスサイズ: {index_size_mb:.2f} MB\n"
+    "📋 承認パッチ: {approved_patches} 件"
+)
+
+_SUMMARY_DEFAULTS = {
+    'date': '----',
+    'new_datasets': 0,
+    'new_examples': 0,
+    'new_indexed_documents': 0,
+    'index_size_mb': 0,
+    'approved_patches': 0,
+}
+
 
 def format_summary(summary: dict) -> str:
     """Format summary dict into readable output"""
-    lines = []
-    d = summary.get('date', '----')
-    lines.append(f"📅 {d}")
-    lines.append("─" * 60)
-    
-    # Stats
-    nd = summary.get('new_datasets', 0)
-    ne = summary.get('new_examples', 0)
-    ni = summary.get('new_indexed_documents', 0)
-    ap = summary.get('approved_patches', 0)
-    idx_mb = summary.get('index_size_mb', 0)
-    
-    lines.append(f"📚 新規データセット: {nd} 件")
-    lines.append(f"📊 学習例追加: {ne} 件")
-    lines.append(f"🗂️  新規インデックスドキュメント: {ni} 件")
-    lines.append(f"💾 インデックスサイズ: {idx_mb:.2f} MB")
-    lines.append(f"📋 承認パッチ: {ap} 件")
+    text = _SUMMARY_TEMPLATE.format_map(ChainMap(summary, _SUMMARY_DEFAULTS))
     
     # Learned skills
     skills = summary.get('learned_skills', [])
-    if skills:
-        lines.append("")
-        lines.append("✨ 学習したスキル:")
-        for s in skills:
-            if isinstance(s, dict):
-                name = s.get('name') or s.get('skill') or str(s)
-            else:
-                name = str(s)
-            lines.append(f"  • {name}")
-    
+    if not skills:
+        return text
+    lines = [text, "", "✨ 学習したスキル:"]
+    for s in skills:
+        if isinstance(s, dict):
+            name = s.get('name') or s.get('skill') or str(s)
+        else:
+            name = str(s)
+        lines.append(f"  • {name}")
     return "\n".join(lines)
 
 
@@ -54,8 +64,7 @@ def show_latest():
         print("❌ サマリファイルがありません")
         return
     
-    with open(files[0], 'r', encoding='utf-8') as f:
-        summary = json.load(f)
+    summary = _json_loads(files[0].read_bytes())
     
     print(format_summary(summary))
 
@@ -68,8 +77,7 @@ def show_for_date(d: date):
         print(f"❌ {d.isoformat()} のサマリが見つかりません")
         return
     
-    with open(f, 'r', encoding='utf-8') as fh:
-        summary = json.load(fh)
+    summary = _json_loads(f.read_bytes())
     
     print(format_summary(summary))
 
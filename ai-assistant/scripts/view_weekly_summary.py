@@ -5,6 +5,12 @@ from pathlib import Path
 from datetime import date, timedelta
 from config import Config
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 def main():
     summaries_dir = Config.DATA_DIR / 'summaries'
@@ -29,8 +35,7 @@ def main():
     }
     
     for f in reversed(files):
-        with open(f, 'r', encoding='utf-8') as fh:
-            s = json.load(fh)
+        s = _json_loads(f.read_bytes())
         
         date_str = s.get('date', '----')
         nd = s.get('new_datasets', 0)
@@ -1,14 +1,36 @@
 """
 Skills Manager - Manages AI capabilities and tools
 """
+import atexit
 import json
 import logging
+import threading
+import time
 from typing import Dict, List, Optional
 from dataclasses import dataclass, asdict
 from config import Config
+from src.utils.file_manager import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 
+# Skill updates are coalesced: the memory file is rewritten at most once per interval
+MEMORY_FLUSH_INTERVAL = 5.0
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_pretty(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 @dataclass
 class Skill:
     name: str
@@ -22,8 +44,12 @@ class SkillManager:
     def __init__(self):
         self.skills: Dict[str, Skill] = {}
         self.memory_file = Config.MEMORY_FILE
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
         self._initialize_default_skills()
         self._load_memory()
+        atexit.register(self.flush)
     
     def _initialize_default_skills(self):
         """Initialize default skills"""
@@ -81,7 +107,7 @@ class SkillManager:
         skill.accuracy = min(accuracy, 1.0)  # Cap at 1.0
         skill.usage_count += 1
         
-        self._save_memory()
+        self._mark_dirty()
         logger.info(f"Skill '{skill_name}' learned with accuracy {accuracy:.2f}")
         return True
     
@@ -97,7 +123,7 @@ class SkillManager:
         skill.accuracy = new_accuracy
         skill.usage_count += 1
         
-        self._save_memory()
+        self._mark_dirty()
         logger.info(f"Skill '{skill_name}' improved to accuracy {new_accuracy:.2f}")
         return True
     
@@ -113,45 +139,74 @@ class SkillManager:
         """Get all learned skills"""
         return [skill for skill in self.skills.values() if skill.is_learned]
     
-    def _save_memory(self):
-        """Save skill memory to file"""
+    def _mark_dirty(self):
+        with self._lock:
+            self._dirty = True
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="skill-memory-flush", daemon=True
+                )
+                self._flusher.start()
+    
+    def _flush_loop(self):
+        while True:
+            time.sleep(MEMORY_FLUSH_INTERVAL)
+            self.flush()
+    
+    def flush(self):
+        """Write pending skill updates to the memory file (no-op when nothing changed)"""
+        with self._lock:
+            # Stay dirty if the write fails so the timer/atexit flush retries it
+            if self._dirty and self._save_memory():
+                self._dirty = False
+    
+    def _save_memory(self) -> bool:
+        """Save skill memory to file; returns False if the write failed"""
         try:
             memory = {
                 "conversations": [],  # Will be updated by learning system
                 "learned_skills": [asdict(skill) for skill in self.get_learned_skills()]
             }
-            with open(self.memory_file, 'w', encoding='utf-8') as f:
-                json.dump(memory, f, ensure_ascii=False, indent=2)
+            # Write-then-rename: a crash mid-write never leaves a truncated memory file
+            atomic_write_bytes(self.memory_file, _dumps_pretty(memory))
+            return True
         except Exception as e:
             logger.error(f"Error saving memory: {e}")
+            return False
     
     def _load_memory(self):
         """Load skill memory from file"""
         try:
             if self.memory_file.exists():
-                with open(self.memory_file, 'r', encoding='utf-8') as f:
-                    memory = json.load(f)
-                    
-                    # Update skills with learned status
-                    for skill_data in memory.get("learned_skills", []):
-                        skill_name = skill_data.get("name")
-                        if skill_name in self.skills:
-                            skill = self.skills[skill_name]
-                            skill.is_learned = skill_data.get("is_learned", False)
-                            skill.accuracy = skill_data.get("accuracy", 0.0)
-                            skill.usage_count = skill_data.get("usage_count", 0)
+                memory = _loads(self.memory_file.read_bytes())
+                
+                # Update skills with learned status
+                for skill_data in memory.get("learned_skills", []):
+                    skill_name = skill_data.get("name")
+                    if skill_name in self.skills:
+                        skill = self.skills[skill_name]
+                        skill.is_learned = skill_data.get("is_learned", False)
+                        skill.accuracy = skill_data.get("accuracy", 0.0)
+                        skill.usage_count = skill_data.get("usage_count", 0)
         except Exception as e:
             logger.error(f"Error loading memory: {e}")
     
     def get_status(self) -> Dict:
         """Get current skill status"""
         total_skills = len(self.skills)
-        learned_skills = len(self.get_learned_skills())
-        avg_accuracy = sum(s.accuracy for s in self.skills.values()) / total_skills if total_skills > 0 else 0
+        # One pass collects both aggregates and the per-skill view
+        learned_skills = 0
+        accuracy_sum = 0.0
+        skills = {}
+        for name, skill in self.skills.items():
+            learned_skills += skill.is_learned
+            accuracy_sum += skill.accuracy
+            skills[name] = asdict(skill)
+        avg_accuracy = accuracy_sum / total_skills if total_skills > 0 else 0
         
         return {
             "total_skills": total_skills,
             "learned_skills": learned_skills,
             "average_accuracy": avg_accuracy,
-            "skills": {name: asdict(skill) for name, skill in self.skills.items()}
+            "skills": skills
         }
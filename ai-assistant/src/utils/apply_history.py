@@ -1,29 +1,71 @@
 """
 Apply history - 適用履歴を記録/取得
 """
+import atexit
 import json
+import os
+import threading
 import time
 from pathlib import Path
 from typing import List, Dict
 from config import Config
 
 HISTORY_FILE = Config.DATA_DIR / "apply_history.jsonl"
+TAIL_CHUNK = 64 * 1024
+
+
+_fh = None
+_lock = threading.Lock()
+
+
+def _close_history():
+    global _fh
+    with _lock:
+        if _fh is not None:
+            _fh.close()
+            _fh = None
 
 
 def add_record(record: Dict):
+    global _fh
     record = dict(record)
     record.setdefault("ts", int(time.time()))
-    with open(HISTORY_FILE, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    with _lock:
+        # One handle for the process lifetime instead of open/close per record. It is
+        # unbuffered in append mode: each record is a single write(), so lines from
+        # other processes appending to the same file never interleave.
+        if _fh is None:
+            _fh = open(HISTORY_FILE, "ab", buffering=0)
+            atexit.register(_close_history)
+        _fh.write(line)
+
+
+def _tail_lines(path: Path, count: int) -> List[bytes]:
+    """Last `count` lines of a file, reading backwards in TAIL_CHUNK blocks."""
+    with open(path, "rb") as f:
+        if count <= 0:
+            return f.read().splitlines()
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        # One newline more than needed guarantees the oldest kept line is complete
+        while pos > 0 and data.count(b"\n") <= count:
+            step = min(TAIL_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:]
+    return lines[-count:]
 
 
 def list_records(limit: int = 50) -> List[Dict]:
     if not HISTORY_FILE.exists():
         return []
-    with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-        lines = f.readlines()
+    # Cost depends on `limit`, not on how large the history has grown
     items = []
-    for line in lines[-limit:]:
+    for line in _tail_lines(HISTORY_FILE, limit):
         try:
             items.append(json.loads(line))
         except Exception:
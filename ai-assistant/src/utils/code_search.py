@@ -1,39 +1,131 @@
 """
 Code search - リポジトリ内の簡易検索
 """
+import os
+import re
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterator, Iterable, Optional
 from config import Config
 
 DEFAULT_EXTS = [".py", ".md", ".txt", ".json", ".yml", ".yaml"]
-DEFAULT_IGNORE_DIRS = {".git", ".venv", "__pycache__", "data", "models", "logs", "backups"}
+DEFAULT_IGNORE_DIRS = frozenset({".git", ".venv", "__pycache__", "data", "models", "logs", "backups"})
+
+
+def suffix_tuple(exts: Iterable[str]) -> tuple:
+    """Lowercased extensions as a tuple, so the per-file test is one name.lower().endswith() call."""
+    return tuple(sorted({e.lower() for e in exts}))
+
+
+def scandir_recursive(root, ignore_dirs: Iterable[str] = ()) -> Iterator[os.DirEntry]:
+    """Yield file entries under root, never descending into ignored dirs or dir symlinks.
+
+    DirEntry caches the type from the directory read, so no extra stat() is needed per entry.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        subdirs = []
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in ignore_dirs:
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+            except OSError:
+                continue
+    for sub in subdirs:
+        yield from scandir_recursive(sub, ignore_dirs)
+
+
+def _compile(query: str):
+    # The regex engine folds case per character in C, so no lowered copy of the file is built
+    return re.compile(re.escape(query), re.IGNORECASE)
+
+
+def _hit_lines(text: str, offsets: Iterable[int]) -> Iterator[tuple]:
+    """(line_no, line_start, line_end) once per line containing a hit; offsets must be ascending."""
+    line_no, counted_to, line_end = 1, 0, -1
+    for pos in offsets:
+        if pos <= line_end:
+            continue
+        start = text.rfind("\n", 0, pos) + 1
+        line_end = text.find("\n", pos)
+        if line_end == -1:
+            line_end = len(text)
+        line_no += text.count("\n", counted_to, start)
+        counted_to = start
+        yield line_no, start, line_end
+
+
+def _find_lines(text: str, pat) -> Iterator[tuple]:
+    """(line_no, line) for each line matching the compiled query pattern."""
+    for line_no, start, end in _hit_lines(text, (m.start() for m in pat.finditer(text))):
+        yield line_no, text[start:end]
+
+
+def _ascii_offsets(folded: bytes, q: bytes) -> Iterator[int]:
+    pos = folded.find(q)
+    while pos != -1:
+        yield pos
+        pos = folded.find(q, pos + 1)
+
+
+def _search_file(raw: bytes, pat, q_ascii: Optional[bytes]) -> Iterator[tuple]:
+    """(line_no, line) for each matching line of a file's raw bytes.
+
+    Pure-ASCII files with an ASCII query are case-folded as bytes (bytes.lower() only maps
+    A-Z) and scanned with bytes.find; anything else goes through the compiled pattern.
+    """
+    if q_ascii is not None and raw.isascii():
+        folded = raw.lower()
+        if q_ascii not in folded:
+            return
+        text = raw.decode("ascii")
+        for line_no, start, end in _hit_lines(text, _ascii_offsets(folded, q_ascii)):
+            yield line_no, text[start:end]
+    else:
+        yield from _find_lines(_decode(raw), pat)
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="ignore")
+
+
+def _iter_sources(exts: List[str]) -> Iterator[tuple]:
+    """(path, raw bytes or None if unreadable) for each searchable file under the repo root."""
+    suffixes = suffix_tuple(exts)
+    for entry in scandir_recursive(Config.BASE_DIR, DEFAULT_IGNORE_DIRS):
+        if not entry.name.lower().endswith(suffixes):
+            continue
+        try:
+            with open(entry.path, "rb") as f:
+                raw = f.read()
+        except Exception:
+            raw = None
+        yield entry.path, raw
 
 
 def search_code(query: str, max_files: int = 200, max_matches: int = 50, exts: List[str] = None) -> Dict:
     if not query:
         return {"query": query, "matches": []}
     exts = exts or DEFAULT_EXTS
+    pat = _compile(query)
+    q_ascii = query.lower().encode("ascii") if query.isascii() else None
     matches = []
     files_scanned = 0
 
-    for path in Config.BASE_DIR.rglob("*"):
-        if path.is_dir():
-            continue
-        if path.suffix.lower() not in exts:
-            continue
-        if any(part in DEFAULT_IGNORE_DIRS for part in path.parts):
-            continue
+    for path, raw in _iter_sources(exts):
         files_scanned += 1
-        try:
-            text = path.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            continue
-        for i, line in enumerate(text.splitlines(), 1):
-            if query.lower() in line.lower():
-                matches.append({"file": str(path), "line": i, "text": line.strip()[:300]})
+        if raw is not None:
+            for line_no, line in _search_file(raw, pat, q_ascii):
+                matches.append({"file": path, "line": line_no, "text": line.strip()[:300]})
                 if len(matches) >= max_matches:
                     return {"query": query, "matches": matches, "files_scanned": files_scanned}
         if max_files and files_scanned >= max_files:
             break
 
     return {"query": query, "matches": matches, "files_scanned": files_scanned}
+
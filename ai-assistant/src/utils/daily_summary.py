@@ -4,6 +4,15 @@ import json
 import os
 
 from config import Config
+from src.utils.file_manager import atomic_write_text
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+COUNT_CHUNK = 1 << 20
+_ITEM_EVENTS = frozenset(('start_map', 'start_array', 'string', 'number', 'boolean', 'null'))
 
 
 def _day_range(target_date: date):
@@ -12,6 +21,38 @@ def _day_range(target_date: date):
     return start.timestamp(), end.timestamp()
 
 
+def _count_lines(path) -> int:
+    """Line count read in binary chunks (no decode, no per-line objects)"""
+    n = 0
+    last = b'\n'
+    with open(path, 'rb') as fh:
+        for buf in iter(lambda: fh.read(COUNT_CHUNK), b''):
+            n += buf.count(b'\n')
+            last = buf[-1:]
+    # a final line without a trailing newline still counts
+    return n + (last != b'\n')
+
+
+def _count_documents(path) -> int:
+    """len() of the top-level JSON array/object, streamed with ijson when it is installed"""
+    with open(path, 'rb') as fh:
+        if ijson is None:
+            return len(json.load(fh))
+        n = 0
+        top = None
+        for prefix, event, _ in ijson.parse(fh):
+            if top is None:
+                top = event
+                if top not in ('start_array', 'start_map'):
+                    raise TypeError(f'{path}: top-level JSON value has no length')
+            elif top == 'start_array':
+                if prefix == 'item' and event in _ITEM_EVENTS:
+                    n += 1
+            elif prefix == '' and event == 'map_key':
+                n += 1
+        return n
+
+
 def generate_summary_for_date(target_date: date = None) -> Path:
     """Generate daily learning summary for target_date (defaults to today).
 
@@ -45,8 +86,7 @@ def generate_summary_for_date(target_date: date = None) -> Path:
                 if start_ts <= mtime < end_ts:
                     summary['new_datasets'] += 1
                     # count lines as examples
-                    with open(f, 'r', encoding='utf-8', errors='ignore') as fh:
-                        summary['new_examples'] += sum(1 for _ in fh)
+                    summary['new_examples'] += _count_lines(f)
             except Exception:
                 pass
 
@@ -57,9 +97,7 @@ def generate_summary_for_date(target_date: date = None) -> Path:
             try:
                 mtime = docs_file.stat().st_mtime
                 if start_ts <= mtime < end_ts:
-                    with open(docs_file, 'r', encoding='utf-8') as df:
-                        docs = json.load(df)
-                        summary['new_indexed_documents'] = len(docs)
+                    summary['new_indexed_documents'] = _count_documents(docs_file)
                 # index size
                 idx_file = vs_dir / 'index.faiss'
                 if idx_file.exists():
@@ -69,20 +107,25 @@ def generate_summary_for_date(target_date: date = None) -> Path:
 
     # Patches: approved today
     if patches_dir.exists():
-        for patch_dir in patches_dir.iterdir():
-            if patch_dir.is_dir():
-                prop = patch_dir / 'proposal.json'
-                if prop.exists():
-                    try:
-                        with open(prop, 'r', encoding='utf-8') as pf:
-                            data = json.load(pf)
-                            status = data.get('status', '')
-                            # use file mtime as heuristic
-                            mtime = prop.stat().st_mtime
-                            if status == 'APPROVED' and start_ts <= mtime < end_ts:
-                                summary['approved_patches'] += 1
-                    except Exception:
-                        pass
+        with os.scandir(patches_dir) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                prop = os.path.join(entry.path, 'proposal.json')
+                try:
+                    # use file mtime as heuristic; proposals outside the day are never parsed
+                    mtime = os.stat(prop).st_mtime
+                except OSError:
+                    continue
+                if not start_ts <= mtime < end_ts:
+                    continue
+                try:
+                    with open(prop, 'r', encoding='utf-8') as pf:
+                        data = json.load(pf)
+                    if data.get('status', '') == 'APPROVED':
+                        summary['approved_patches'] += 1
+                except Exception:
+                    pass
 
         # Learned skills: inspect memory file for learned_skills with timestamps
         mem_file = cfg.MEMORY_FILE
@@ -132,12 +175,7 @@ def generate_summary_for_date(target_date: date = None) -> Path:
     summaries_dir.mkdir(parents=True, exist_ok=True)
 
     out_file = summaries_dir / f'{target_date.isoformat()}.json'
-    try:
-        out_file.write_text(json.dumps(summary, ensure_ascii=False, indent=2))
-    except Exception:
-        # attempt via open
-        with open(out_file, 'w', encoding='utf-8') as of:
-            json.dump(summary, of, ensure_ascii=False, indent=2)
+    atomic_write_text(out_file, json.dumps(summary, ensure_ascii=False, separators=(',', ':')))
 
     return out_file
 
@@ -148,7 +186,9 @@ def load_recent_summaries(days: int = 7):
     if not summaries_dir.exists():
         return []
 
-    files = sorted(summaries_dir.glob('*.json'), reverse=True)
+    # File names are ISO dates, so name order is date order; no stat() needed
+    with os.scandir(summaries_dir) as it:
+        files = sorted((e.path for e in it if e.name.endswith('.json')), reverse=True)
     result = []
     for f in files[:days]:
         try:
@@ -1,22 +1,45 @@
 import json
+import time
 from pathlib import Path
 from datetime import datetime
 from config import Config
+from src.utils.file_manager import atomic_write_text
 
 PROPOSALS_FILE = Config.DATA_DIR / "feature_proposals.json"
 
+# Parsed proposals keyed by the file's (mtime_ns, size); reused until the file changes
+_cache = {"key": None, "data": []}
+
+
+def _file_key():
+    try:
+        st = PROPOSALS_FILE.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _copy(items):
+    # Proposals are flat dicts; callers may mutate what they get back
+    return [dict(p) for p in items]
+
 
 def _load():
-    if PROPOSALS_FILE.exists():
+    key = _file_key()
+    if key is None:
+        return []
+    if key != _cache["key"]:
         try:
-            return json.loads(PROPOSALS_FILE.read_text(encoding="utf-8"))
+            data = json.loads(PROPOSALS_FILE.read_text(encoding="utf-8"))
         except Exception:
-            return []
-    return []
+            data = []
+        _cache["key"], _cache["data"] = key, data
+    return _copy(_cache["data"])
 
 
 def _save(items):
-    PROPOSALS_FILE.write_text(json.dumps(items, ensure_ascii=False, indent=2), encoding="utf-8")
+    atomic_write_text(PROPOSALS_FILE, json.dumps(items, ensure_ascii=False, indent=2))
+    _cache["key"], _cache["data"] = _file_key(), _copy(items)
 
 
 def list_proposals(status=None):
@@ -28,14 +51,20 @@ def list_proposals(status=None):
 
 def create_proposal(title: str, description: str, requested_by: str = "auto"):
     items = _load()
-    pid = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Nanosecond ids so two proposals in the same second do not collide. They are
+    # not comparable with legacy second-based ids; the list keeps creation order
+    # by appending, so order by position (or created_at), never by id
+    ns = time.time_ns()
+    taken = {p.get("id") for p in items}
+    while f"{ns:020d}" in taken:
+        ns += 1
     proposal = {
-        "id": pid,
+        "id": f"{ns:020d}",
         "title": title,
         "description": description,
         "status": "PROPOSED",
         "requested_by": requested_by,
-        "created_at": datetime.now().isoformat(),
+        "created_at": datetime.fromtimestamp(ns / 1e9).isoformat(),
     }
     items.append(proposal)
     _save(items)
@@ -14,12 +14,40 @@ Usage:
  path = fm.write_component_file('patches', 'proposal.json', json_text)
 """
 from pathlib import Path
-import shutil
+import functools
+import os
+import threading
 import time
 import json
 
 from config import Config
 
+# Large enough that state and summary files go out in a single write() call
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write data to a sibling temp file in one buffered write, then rename it over path."""
+    path = Path(path)
+    # Unique per process and thread: with a shared temp name, one writer's os.replace
+    # could move another writer's half-written file into place
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        with open(tmp, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, data: str, encoding: str = 'utf-8') -> None:
+    """atomic_write_bytes for text."""
+    atomic_write_bytes(path, data.encode(encoding))
+
 class FileManager:
     def __init__(self):
         self.map = Config.AUTO_FILE_MAP
@@ -42,16 +70,23 @@ class FileManager:
         """
         d = self.ensure_dir(component)
         p = d / filename
-        if backup and p.exists():
-            ts = int(time.time())
-            b = p.with_name(f"{p.stem}.bak.{ts}{p.suffix}")
-            shutil.move(str(p), str(b))
         # Ensure parent exists
         p.parent.mkdir(parents=True, exist_ok=True)
-        # Write
         if isinstance(content, (dict, list)):
             content = json.dumps(content, ensure_ascii=False, indent=2)
-        p.write_text(content, encoding='utf-8')
+        # Write next to the target first so readers never see a half-written file
+        tmp = p.with_name(f".{p.name}.tmp")
+        tmp.write_text(content, encoding='utf-8')
+        try:
+            if backup and p.exists():
+                ts = int(time.time())
+                b = p.with_name(f"{p.stem}.bak.{ts}{p.suffix}")
+                # Same directory, so this is a single rename
+                os.replace(p, b)
+            os.replace(tmp, p)
+        except BaseException:
+            tmp.unlink()
+            raise
         return p
 
     def create_shim(self, component: str, module_path: str, shim_name: str = None) -> Path:
@@ -80,8 +115,10 @@ if __name__ == '__main__':
         shim_path.write_text(shim_code, encoding='utf-8')
         return shim_path
 
-# Simple convenience instance
-_default_file_manager = FileManager()
+# Simple convenience instance, created on first use rather than at import
+@functools.cache
+def _default_file_manager() -> FileManager:
+    return FileManager()
 
 def write_component_file(component: str, filename: str, content: str, backup: bool = True) -> Path:
-    return _default_file_manager.write_component_file(component, filename, content, backup)
+    return _default_file_manager().write_component_file(component, filename, content, backup)
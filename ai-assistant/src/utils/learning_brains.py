@@ -4,8 +4,7 @@ Learning brains - 学習用タスクの多様化
 from typing import List, Dict
 
 
-def get_brain_tasks() -> List[Dict[str, str]]:
-    """Return diverse learning tasks with task_type tags."""
+def _build_brain_tasks() -> List[Dict[str, str]]:
     base = [
         {"task_type": "summary", "prompt": "このドキュメントを要約して、要点を3〜5個の箇条書きで示してください。"},
         {"task_type": "analysis", "prompt": "この内容の背景・目的・影響を整理して分析してください。"},
@@ -37,3 +36,15 @@ def get_brain_tasks() -> List[Dict[str, str]]:
         expanded.append({"task_type": "topic_pitfall", "prompt": f"{t}の失敗例と回避策を3つ示してください。"})
 
     return base + expanded
+
+
+# The task list is fixed, so it is built once at import
+_BRAIN_TASKS = tuple(_build_brain_tasks())
+
+
+def get_brain_tasks() -> List[Dict[str, str]]:
+    """Return diverse learning tasks with task_type tags.
+
+    A new list each call (callers shuffle and slice it); the task dicts are shared, treat them as read-only.
+    """
+    return list(_BRAIN_TASKS)
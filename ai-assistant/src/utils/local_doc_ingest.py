@@ -2,17 +2,35 @@
 Local document ingestion with optional OCR for image files.
 """
 import json
+import os
 import time
 import hashlib
 import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 from config import Config
 from vector_store import VectorStore
 from src.utils.provider_selector import select_provider
+from src.utils.code_search import scandir_recursive, suffix_tuple
+from src.utils.file_manager import atomic_write_text
+
+try:
+    from tesserocr import PyTessBaseAPI, PSM, OEM
+except Exception:
+    PyTessBaseAPI = None
 
 logger = logging.getLogger(__name__)
 
+# One tesseract API per thread: PyTessBaseAPI is not thread-safe, and creating it per image
+# costs as much as the fork pytesseract does
+_tls = threading.local()
+
+# Bytes of an image hashed to tell a touched file from a changed one
+HEAD_HASH_BYTES = 64 * 1024
+
 
 def load_local_docs_state() -> dict:
     try:
@@ -30,11 +48,67 @@ def _save_local_docs_state(added: int, scanned: int):
             "added": int(added),
             "scanned": int(scanned),
         }
-        Config.LOCAL_DOC_INGEST_STATE_FILE.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        atomic_write_text(Config.LOCAL_DOC_INGEST_STATE_FILE, json.dumps(state, ensure_ascii=False, separators=(",", ":")))
     except Exception:
         pass
 
 
+def _tess_options(tess_config: str):
+    """PyTessBaseAPI kwargs and variables for a tesseract CLI config string, or None if unsupported"""
+    kwargs, variables = {}, {}
+    tokens = tess_config.split()
+    try:
+        while tokens:
+            flag = tokens.pop(0)
+            if flag == "--psm":
+                kwargs["psm"] = PSM(int(tokens.pop(0)))
+            elif flag == "--oem":
+                kwargs["oem"] = OEM(int(tokens.pop(0)))
+            elif flag == "-c":
+                name, value = tokens.pop(0).split("=", 1)
+                variables[name] = value
+            else:
+                return None
+    except (IndexError, ValueError):
+        return None
+    return kwargs, variables
+
+
+def _open_tess_api(lang: str, tess_config: str):
+    options = _tess_options(tess_config)
+    if options is None:
+        return None
+    kwargs, variables = options
+    try:
+        api = PyTessBaseAPI(lang=lang, **kwargs)
+        for name, value in variables.items():
+            api.SetVariable(name, value)
+        return api
+    except Exception as e:
+        logger.debug(f"[OCR] tesserocr unavailable for lang={lang}: {e}")
+        return None
+
+
+def _tesserocr_read(img, lang: str, tess_config: str):
+    """OCR through an in-process tesseract kept per thread; None means use pytesseract instead"""
+    if PyTessBaseAPI is None:
+        return None
+    key = (lang, tess_config)
+    if getattr(_tls, "key", None) != key:
+        # A failed or unsupported setup is remembered too, so it is not retried per image
+        if getattr(_tls, "api", None) is not None:
+            _tls.api.End()
+        _tls.api, _tls.key = _open_tess_api(lang, tess_config), key
+    if _tls.api is None:
+        return None
+    try:
+        _tls.api.SetImage(img)
+        return _tls.api.GetUTF8Text()
+    except Exception as e:
+        logger.debug(f"[OCR] tesserocr failed, using pytesseract: {e}")
+        return None
+
+
 def ocr_image_file(path: Path) -> str:
     try:
         provider = select_provider("ocr", "tesseract")
@@ -81,6 +155,9 @@ def ocr_image_file(path: Path) -> str:
 
         lang = getattr(Config, "OCR_LANG", "eng") or "eng"
         tess_config = getattr(Config, "OCR_TESS_CONFIG", "") or ""
+        text = _tesserocr_read(img, lang, tess_config)
+        if text is not None:
+            return text.strip()
         try:
             text = pytesseract.image_to_string(img, lang=lang, config=tess_config)
         except Exception:
@@ -95,16 +172,61 @@ def ocr_image_file(path: Path) -> str:
         return ""
 
 
-def process_image_for_learning(path: Path, rebuild: bool = True) -> dict:
+def _doc_paths(path: Path):
+    """(clean text path, sidecar meta path) for a source file"""
+    clean_dir = Config.DATA_DIR / "clean"
+    doc_id = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:16]
+    return clean_dir / f"local_{doc_id}.txt", clean_dir / f"local_{doc_id}.meta.json"
+
+
+def _head_sha(path: Path) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read(HEAD_HASH_BYTES)).hexdigest()
+
+
+def _ocr_is_current(path: Path, st: os.stat_result, out: Path, meta_path: Path) -> bool:
+    """True if out already holds OCR text for this exact image content.
+
+    Same size and mtime is trusted as-is; a touched file with the same size is compared by
+    the hash of its first HEAD_HASH_BYTES and the sidecar mtime is refreshed on a match.
+    """
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except Exception:
+        return False
+    if meta.get("size") != st.st_size or not out.exists():
+        return False
+    if meta.get("mtime") == st.st_mtime:
+        return True
+    try:
+        head_sha = _head_sha(path)
+    except OSError:
+        return False
+    if meta.get("head_sha") != head_sha:
+        return False
+    _write_meta(meta_path, st, head_sha)
+    return True
+
+
+def _write_meta(meta_path: Path, st: os.stat_result, head_sha: str):
     try:
+        meta_path.write_text(json.dumps({"size": st.st_size, "mtime": st.st_mtime, "head_sha": head_sha}), encoding="utf-8")
+    except Exception:
+        pass
+
+
+def process_image_for_learning(path: Path, rebuild: bool = True, st: os.stat_result = None) -> dict:
+    try:
+        st = st or os.stat(path)
+        out, meta_path = _doc_paths(path)
+        if _ocr_is_current(path, st, out, meta_path):
+            return {"ok": True, "unchanged": True, "clean_file": str(out)}
         text = ocr_image_file(path)
         if not text:
             return {"ok": False, "reason": "empty_text"}
-        clean_dir = Config.DATA_DIR / "clean"
-        clean_dir.mkdir(parents=True, exist_ok=True)
-        doc_id = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:16]
-        out = clean_dir / f"local_{doc_id}.txt"
+        out.parent.mkdir(parents=True, exist_ok=True)
         out.write_text(text, encoding="utf-8")
+        _write_meta(meta_path, st, _head_sha(path))
         result = {"ok": True, "text": text, "clean_file": str(out)}
         if rebuild:
             result["vector_store"] = build_vector_store_from_clean()
@@ -125,34 +247,48 @@ def _load_watch_state() -> dict:
 
 def _save_watch_state(state: dict):
     try:
-        Config.OCR_WATCH_STATE_FILE.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        atomic_write_text(Config.OCR_WATCH_STATE_FILE, json.dumps(state, ensure_ascii=False, separators=(",", ":")))
     except Exception:
         pass
 
 
 def ingest_images_from_dirs(dirs, rebuild: bool = False) -> dict:
-    img_exts = set([e.lower() for e in (getattr(Config, "OCR_IMAGE_EXTS", []) or [])])
+    img_exts = suffix_tuple(getattr(Config, "OCR_IMAGE_EXTS", []) or [])
     state = _load_watch_state()
     processed = 0
     added = 0
+    pending = {}  # state key -> (path, stat) for images new or modified since the last run
     for d in (dirs or []):
         base = Path(d)
         if not base.exists():
             continue
-        for p in base.rglob("*"):
-            if p.is_dir():
-                continue
-            if p.suffix.lower() not in img_exts:
+        for entry in scandir_recursive(base):
+            if not entry.name.lower().endswith(img_exts):
                 continue
+            p = Path(entry.path)
             key = str(p.resolve())
-            mtime = p.stat().st_mtime
-            if state.get(key) and state.get(key) >= mtime:
+            st = entry.stat()
+            if key in pending or (state.get(key) and state.get(key) >= st.st_mtime):
                 continue
-            processed += 1
-            result = process_image_for_learning(p, rebuild=False)
-            if result.get("ok"):
+            pending[key] = (p, st)
+
+    paths = [p for p, _ in pending.values()]
+    stats = [st for _, st in pending.values()]
+    if len(pending) > 1:
+        # tesseract is CPU-bound per image; fan images out across cores
+        workers = min(len(pending), os.cpu_count() or 1)
+        chunksize = max(1, min(8, len(pending) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(process_image_for_learning, paths, repeat(False), stats, chunksize=chunksize))
+    else:
+        results = [process_image_for_learning(p, False, st) for p, st in zip(paths, stats)]
+
+    for (key, (_, st)), result in zip(pending.items(), results):
+        processed += 1
+        if result.get("ok"):
+            if not result.get("unchanged"):
                 added += 1
-                state[key] = mtime
+            state[key] = st.st_mtime
     if processed:
         _save_watch_state(state)
     if rebuild and added:
@@ -178,9 +314,9 @@ def ingest_local_docs_to_clean(force: bool = False) -> dict:
 
         clean_dir = Config.DATA_DIR / "clean"
         clean_dir.mkdir(parents=True, exist_ok=True)
-        exts = set([e.lower() for e in (Config.LOCAL_DOC_EXTS or [])])
-        img_exts = set([e.lower() for e in (getattr(Config, "OCR_IMAGE_EXTS", []) or [])])
-        exclude_dirs = set(Config.LOCAL_DOC_EXCLUDE_DIRS or [])
+        exts = suffix_tuple(Config.LOCAL_DOC_EXTS or [])
+        img_exts = suffix_tuple(getattr(Config, "OCR_IMAGE_EXTS", []) or [])
+        exclude_dirs = frozenset(Config.LOCAL_DOC_EXCLUDE_DIRS or [])
         max_files = int(Config.LOCAL_DOC_MAX_FILES or 0)
         max_chars = int(Config.LOCAL_DOC_MAX_CHARS or 0)
         total = 0
@@ -189,34 +325,43 @@ def ingest_local_docs_to_clean(force: bool = False) -> dict:
             base = Path(base)
             if not base.exists():
                 continue
-            for p in base.rglob("*"):
-                if p.is_dir():
-                    continue
-                rel = str(p.relative_to(Config.BASE_DIR)) if str(p).startswith(str(Config.BASE_DIR)) else str(p)
-                if any(part in exclude_dirs for part in Path(rel).parts):
-                    continue
-                suffix = p.suffix.lower()
-                if exts and suffix not in exts and suffix not in img_exts:
+            rel = str(base.relative_to(Config.BASE_DIR)) if str(base).startswith(str(Config.BASE_DIR)) else str(base)
+            if any(part in exclude_dirs for part in Path(rel).parts):
+                continue
+            # Excluded dirs below base are pruned during the walk
+            for entry in scandir_recursive(base, exclude_dirs):
+                p = Path(entry.path)
+                name = entry.name.lower()
+                if exts and not name.endswith(exts) and not name.endswith(img_exts):
                     continue
                 total += 1
                 if max_files and total > max_files:
                     break
                 try:
-                    doc_id = hashlib.sha256(str(p).encode("utf-8")).hexdigest()[:16]
-                    out = clean_dir / f"local_{doc_id}.txt"
-                    if out.exists() and out.stat().st_mtime >= p.stat().st_mtime:
-                        continue
-                    if suffix in img_exts and getattr(Config, "OCR_ENABLED", False):
-                        text = ocr_image_file(p)
-                        if not text:
+                    # DirEntry caches this stat; nothing below re-stats the source
+                    st = entry.stat()
+                    out, meta_path = _doc_paths(p)
+                    is_image = name.endswith(img_exts) and getattr(Config, "OCR_ENABLED", False)
+                    if is_image:
+                        # OCR is the expensive part: skip it unless the image content changed
+                        if _ocr_is_current(p, st, out, meta_path):
                             continue
+                        text = ocr_image_file(p)
                     else:
+                        try:
+                            # one stat of the clean copy instead of exists() + stat()
+                            if os.stat(out).st_mtime >= st.st_mtime:
+                                continue
+                        except FileNotFoundError:
+                            pass
                         text = p.read_text(encoding="utf-8", errors="ignore")
                     if not text:
                         continue
                     if max_chars and len(text) > max_chars:
                         text = text[:max_chars]
                     out.write_text(text, encoding="utf-8")
+                    if is_image:
+                        _write_meta(meta_path, st, _head_sha(p))
                     added += 1
                 except Exception:
                     continue
@@ -233,17 +378,6 @@ def ingest_local_docs_to_clean(force: bool = False) -> dict:
 
 def build_vector_store_from_clean() -> dict:
     clean_dir = Config.DATA_DIR / "clean"
-    texts = []
-    metas = []
-    if clean_dir.exists():
-        for p in clean_dir.iterdir():
-            if p.suffix == ".txt":
-                try:
-                    texts.append(p.read_text(encoding="utf-8", errors="ignore"))
-                    metas.append({"id": p.stem, "meta": {"source": str(p)}})
-                except Exception:
-                    continue
-
     vs = VectorStore()
     vs.texts = []
     vs.metadatas = []
@@ -251,11 +385,22 @@ def build_vector_store_from_clean() -> dict:
     vs.faiss_index = None
     vs.tfidf = None
     vs.nn = None
-    for i, t in enumerate(texts):
-        vs.add(metas[i]["id"], t, metadata=metas[i]["meta"])
-    if texts:
-        logger.info(f"[LOCAL] 🔨 Building vector store from {len(texts)} documents")
+    count = 0
+    if clean_dir.exists():
+        # One file at a time straight into the store; no parallel texts/metas lists
+        with os.scandir(clean_dir) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".txt"))
+        for name in names:
+            p = clean_dir / name
+            try:
+                text = p.read_text(encoding="utf-8", errors="ignore")
+            except Exception:
+                continue
+            vs.add(p.stem, text, metadata={"source": str(p)})
+            count += 1
+    if count:
+        logger.info(f"[LOCAL] 🔨 Building vector store from {count} documents")
         vs.build()
         vs.save()
         logger.info("[LOCAL] ✅ Vector store built and saved")
-    return {"count": len(texts)}
+    return {"count": count}
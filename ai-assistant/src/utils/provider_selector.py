@@ -3,30 +3,81 @@ Provider selector for auto-replacement when internal implementations reach parit
 """
 import json
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
 from config import Config
+from src.utils.file_manager import atomic_write_text
 
 logger = logging.getLogger(__name__)
 
+# Parsed scores keyed by the file's (mtime_ns, size); selections are memoized per parse
+_scores_cache: Dict[str, Any] = {"key": None, "data": {}}
+_selected: Dict[tuple, str] = {}
+# kind -> [(provider, float score)], rebuilt with the cache so selection does no conversions
+_score_table: Dict[str, list] = {}
 
-def _load_scores() -> Dict[str, Dict[str, Any]]:
+
+def _scores_key():
     try:
-        if Config.PROVIDER_SCORES_FILE.exists():
-            data = json.loads(Config.PROVIDER_SCORES_FILE.read_text(encoding="utf-8"))
-            if isinstance(data, dict):
-                return data
-    except Exception as e:
-        logger.warning(f"[PROVIDER] Failed to load scores: {e}")
-    return {}
+        st = Config.PROVIDER_SCORES_FILE.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _as_float(info) -> float:
+    try:
+        return float(info.get("score", 0))
+    except Exception:
+        return 0.0
+
+
+def _set_cache(key, data: Dict[str, Dict[str, Any]]):
+    _scores_cache["key"], _scores_cache["data"] = key, data
+    _score_table.clear()
+    for k, inner in data.items():
+        if isinstance(inner, dict):
+            _score_table[k] = [(provider, _as_float(info)) for provider, info in inner.items()]
+    _selected.clear()
+
+
+@lru_cache(maxsize=64)
+def _norm(name: Optional[str]) -> str:
+    return (name or "").strip().lower()
+
+
+@lru_cache(maxsize=64)
+def _policy(k: str) -> tuple:
+    """(preferred, min_score, auto_switch) for a normalized kind; PROVIDER_POLICY is fixed config"""
+    policy = (Config.PROVIDER_POLICY or {}).get(k, {})
+    return _norm(policy.get("preferred")), float(policy.get("min_score", 0) or 0), bool(policy.get("auto_switch", False))
+
+
+def _cached_scores() -> Dict[str, Dict[str, Any]]:
+    """Shared parsed scores; re-read only when the file changes. Do not mutate."""
+    key = _scores_key()
+    if key != _scores_cache["key"]:
+        data = {}
+        if key is not None:
+            try:
+                loaded = json.loads(Config.PROVIDER_SCORES_FILE.read_text(encoding="utf-8"))
+                if isinstance(loaded, dict):
+                    data = loaded
+            except Exception as e:
+                logger.warning(f"[PROVIDER] Failed to load scores: {e}")
+        _set_cache(key, data)
+    return _scores_cache["data"]
+
+
+def _load_scores() -> Dict[str, Dict[str, Any]]:
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in _cached_scores().items()}
 
 
 def _save_scores(scores: Dict[str, Dict[str, Any]]):
     try:
-        Config.PROVIDER_SCORES_FILE.write_text(
-            json.dumps(scores, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        atomic_write_text(Config.PROVIDER_SCORES_FILE, json.dumps(scores, ensure_ascii=False, separators=(",", ":")))
+        _set_cache(_scores_key(), scores)
     except Exception as e:
         logger.warning(f"[PROVIDER] Failed to save scores: {e}")
 
@@ -46,27 +97,28 @@ def record_provider_score(kind: str, provider: str, score: float, notes: str = "
 
 
 def select_provider(kind: str, fallback: str) -> str:
-    k = (kind or "").strip().lower()
-    policy = (Config.PROVIDER_POLICY or {}).get(k, {})
-    preferred = (policy.get("preferred") or fallback or "").strip().lower()
-    min_score = float(policy.get("min_score", 0) or 0)
-    auto_switch = bool(policy.get("auto_switch", False))
+    k = _norm(kind)
+    preferred, min_score, auto_switch = _policy(k)
+    preferred = preferred or _norm(fallback)
 
     if not auto_switch:
         return preferred or fallback
 
-    scores = _load_scores().get(k, {})
+    _cached_scores()
+    memo_key = (k, fallback)
+    selected = _selected.get(memo_key)
+    if selected is not None:
+        return selected
+
     best_provider: Optional[str] = None
     best_score = min_score
-    for provider, info in scores.items():
-        try:
-            s = float(info.get("score", 0))
-        except Exception:
-            s = 0.0
+    for provider, s in _score_table.get(k, ()):
         if s >= best_score:
             best_score = s
             best_provider = provider
-    return best_provider or preferred or fallback
+    selected = best_provider or preferred or fallback
+    _selected[memo_key] = selected
+    return selected
 
 
 def get_provider_status(kind: str, fallback: str) -> Dict[str, Any]:
@@ -6,27 +6,22 @@ from typing import List, Iterable, Optional
 import logging
 from config import Config
 from vector_store import VectorStore
+from src.utils.code_search import scandir_recursive, suffix_tuple
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_EXTS = [".py", ".md", ".txt", ".json", ".yml", ".yaml"]
-DEFAULT_IGNORE_DIRS = {".git", ".venv", "__pycache__", "data", "models", "logs", "backups"}
+DEFAULT_IGNORE_DIRS = frozenset({".git", ".venv", "__pycache__", "data", "models", "logs", "backups"})
 
 
 def _iter_files(base_dir: Path, exts: List[str], max_files: int) -> Iterable[Path]:
     count = 0
-    for path in base_dir.rglob("*"):
-        if path.is_dir():
-            if path.name in DEFAULT_IGNORE_DIRS:
-                # Skip entire ignored dir
-                for _ in []:
-                    pass
+    suffixes = suffix_tuple(exts)
+    # Ignored dirs are pruned during the walk instead of being walked and filtered afterwards
+    for entry in scandir_recursive(base_dir, DEFAULT_IGNORE_DIRS):
+        if not entry.name.lower().endswith(suffixes):
             continue
-        if path.suffix.lower() not in exts:
-            continue
-        if any(part in DEFAULT_IGNORE_DIRS for part in path.parts):
-            continue
-        yield path
+        yield Path(entry.path)
         count += 1
         if max_files and count >= max_files:
             break
@@ -35,15 +30,14 @@ def _iter_files(base_dir: Path, exts: List[str], max_files: int) -> Iterable[Pat
 def _chunk_text(text: str, chunk_size: int = 2000, overlap: int = 200) -> List[str]:
     if chunk_size <= 0:
         return [text]
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = min(len(text), start + chunk_size)
-        chunks.append(text[start:end])
-        if end >= len(text):
-            break
-        start = max(0, end - overlap)
-    return chunks
+    n = len(text)
+    if n == 0:
+        return []
+    # Chunk starts are an arithmetic progression, so the slicing runs as one comprehension;
+    # the last start is the first whose chunk reaches the end of the text
+    step = max(1, chunk_size - overlap)
+    stop = min(n, max(1, n - chunk_size + step))
+    return [text[i:i + chunk_size] for i in range(0, stop, step)]
 
 
 def index_repository(
@@ -1,81 +1,166 @@
 """
 RSS/Atom collector - 学習用の情報源からURLを収集
 """
+import asyncio
 import json
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from urllib.request import urlopen, Request
+from io import BytesIO
 from xml.etree import ElementTree as ET
 from config import Config
+from src.utils.file_manager import atomic_write_text
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    from lxml import etree as _etree
+    # recover: keep the links of a feed with a stray unescaped '&' instead of dropping it
+    _ITERPARSE_KW = {"recover": True, "resolve_entities": False, "no_network": True}
+except ImportError:
+    _etree = ET
+    _ITERPARSE_KW = {}
 
 logger = logging.getLogger(__name__)
 
 SOURCES_FILE = Config.DATA_DIR / "rss_sources.json"
+RSS_FETCH_WORKERS = 16
+ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+ATOM_LINK = "{http://www.w3.org/2005/Atom}link"
+_XML_ENCODING_RE = re.compile(rb"""<\?xml[^>]*?encoding=["']([A-Za-z0-9._-]+)["']""")
+
+# Sources keyed by the file's (mtime_ns, size); _UNSET forces the first load
+_UNSET = object()
+_cache = {"key": _UNSET, "sources": [], "set": frozenset()}
+
+
+def _file_key():
+    try:
+        st = SOURCES_FILE.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cached_sources() -> dict:
+    """Parsed sources and their set, re-read only when the file changes. Do not mutate."""
+    key = _file_key()
+    if _cache["key"] is _UNSET or key != _cache["key"]:
+        sources = None
+        if key is not None:
+            try:
+                data = json.loads(SOURCES_FILE.read_text(encoding="utf-8"))
+                if isinstance(data, list):
+                    sources = [str(x) for x in data if x]
+            except Exception:
+                pass
+        if sources is None:
+            sources = list(Config.RSS_SOURCES)
+        _cache.update(key=key, sources=sources, set=frozenset(sources))
+    return _cache
 
 
 def load_sources() -> List[str]:
-    if SOURCES_FILE.exists():
-        try:
-            data = json.loads(SOURCES_FILE.read_text(encoding="utf-8"))
-            if isinstance(data, list):
-                return [str(x) for x in data if x]
-        except Exception:
-            pass
-    return list(Config.RSS_SOURCES)
+    return list(_cached_sources()["sources"])
 
 
 def save_sources(sources: List[str]):
+    normalized = sorted(set(sources))
+    cached = _cached_sources()
+    if cached["key"] is not None and cached["sources"] == normalized:
+        # The file already holds exactly this list
+        return
     try:
-        SOURCES_FILE.write_text(json.dumps(sorted(set(sources)), ensure_ascii=False, indent=2), encoding="utf-8")
+        atomic_write_text(SOURCES_FILE, json.dumps(normalized, ensure_ascii=False, indent=2))
+        _cache.update(key=_file_key(), sources=normalized, set=frozenset(normalized))
     except Exception as e:
         logger.error(f"Failed to save RSS sources: {e}")
 
 
 def add_source(url: str) -> List[str]:
     sources = load_sources()
-    if url and url not in sources:
+    if url and url not in _cache["set"]:
         sources.append(url)
         save_sources(sources)
     return sources
 
 
 def remove_source(url: str) -> List[str]:
-    sources = [s for s in load_sources() if s != url]
+    cached = _cached_sources()
+    if url not in cached["set"]:
+        # Nothing to remove; skip the rewrite
+        return list(cached["sources"])
+    sources = [s for s in cached["sources"] if s != url]
     save_sources(sources)
     return sources
 
 
-def _fetch_xml(url: str) -> str:
+def _fetch_xml(url: str) -> bytes:
     req = Request(url, headers={"User-Agent": "AI-Assistant/1.0"})
     with urlopen(req, timeout=Config.RSS_TIMEOUT_SECONDS) as res:
-        return res.read().decode("utf-8", errors="ignore")
-
+        # Raw bytes: the parser honours the feed's own encoding declaration
+        return res.read()
+
+
+def _declared_encoding(xml_bytes: bytes) -> str:
+    match = _XML_ENCODING_RE.match(xml_bytes)
+    return match.group(1).decode("ascii") if match else "utf-8"
+
+
+def _parse_links(xml_bytes) -> List[str]:
+    if isinstance(xml_bytes, str):
+        xml_bytes = xml_bytes.encode("utf-8")
+    rss_links: List[str] = []
+    atom_links: List[str] = []
+    any_links: List[str] = []
+
+    def _scan(elem) -> None:
+        tag = elem.tag
+        if tag == "link":
+            # Fallback: any <link> text
+            if elem.text:
+                any_links.append(elem.text.strip())
+        elif tag == "item":
+            # RSS 2.0
+            link = elem.findtext("link")
+            if link:
+                rss_links.append(link.strip())
+        elif tag == ATOM_ENTRY:
+            # Atom
+            for link in elem.findall(ATOM_LINK):
+                href = link.attrib.get("href")
+                if href:
+                    atom_links.append(href.strip())
 
-def _parse_links(xml_text: str) -> List[str]:
-    links: List[str] = []
     try:
-        root = ET.fromstring(xml_text)
+        # One streaming pass; each item/entry is cleared once its links are read
+        for _, elem in _etree.iterparse(BytesIO(xml_bytes), events=("end",), **_ITERPARSE_KW):
+            _scan(elem)
+            if elem.tag in ("item", ATOM_ENTRY):
+                elem.clear()
+    except (ValueError, ET.ParseError):
+        if _etree is not ET:
+            return []
+        # expat rejects multi-byte encodings such as Shift_JIS/EUC-JP:
+        # decode with the declared encoding and parse the text instead
+        rss_links.clear()
+        atom_links.clear()
+        any_links.clear()
+        try:
+            root = ET.fromstring(xml_bytes.decode(_declared_encoding(xml_bytes)))
+        except Exception:
+            return []
+        for elem in root.iter():
+            _scan(elem)
     except Exception:
-        return links
-
-    # RSS 2.0
-    for item in root.findall(".//item"):
-        link = item.findtext("link")
-        if link:
-            links.append(link.strip())
-
-    # Atom
-    for entry in root.findall(".//{http://www.w3.org/2005/Atom}entry"):
-        for link in entry.findall("{http://www.w3.org/2005/Atom}link"):
-            href = link.attrib.get("href")
-            if href:
-                links.append(href.strip())
-
-    # Fallback: any <link> text
-    if not links:
-        for link in root.findall(".//link"):
-            if link.text:
-                links.append(link.text.strip())
+        return []
+
+    links = (rss_links + atom_links) or any_links
 
     # Deduplicate
     dedup = []
@@ -89,13 +174,54 @@ def _parse_links(xml_text: str) -> List[str]:
 
 def collect_from_sources(sources: List[str], max_items: int = 0) -> List[str]:
     urls: List[str] = []
-    for src in sources:
-        try:
-            xml_text = _fetch_xml(src)
-            urls.extend(_parse_links(xml_text))
-        except Exception as e:
-            logger.warning(f"RSS fetch failed: {src} ({e})")
+    if not sources:
+        return urls
+    # Fetches are network-bound: run them concurrently, then parse in source order
+    with ThreadPoolExecutor(max_workers=min(RSS_FETCH_WORKERS, len(sources))) as ex:
+        futures = [(src, ex.submit(_fetch_xml, src)) for src in sources]
+        for src, fut in futures:
+            try:
+                xml_text = fut.result()
+                urls.extend(_parse_links(xml_text))
+            except Exception as e:
+                logger.warning(f"RSS fetch failed: {src} ({e})")
+                continue
+    if max_items and len(urls) > max_items:
+        urls = urls[:max_items]
+    return urls
+
+
+async def _fetch_xml_async(session, url: str) -> bytes:
+    async with session.get(url) as res:
+        # urlopen raises on HTTP errors; keep the same behaviour
+        res.raise_for_status()
+        return await res.read()
+
+
+async def collect_from_sources_async(sources: List[str], max_items: int = 0,
+                                     concurrency: int = RSS_FETCH_WORKERS) -> List[str]:
+    """collect_from_sources for callers already on an event loop (fetches share that loop)"""
+    if not sources:
+        return []
+    if aiohttp is None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, collect_from_sources, sources, max_items)
+
+    sem = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=Config.RSS_TIMEOUT_SECONDS)
+    async with aiohttp.ClientSession(timeout=timeout, headers={"User-Agent": "AI-Assistant/1.0"}) as session:
+        async def _fetch(src: str) -> bytes:
+            async with sem:
+                return await _fetch_xml_async(session, src)
+
+        results = await asyncio.gather(*(_fetch(src) for src in sources), return_exceptions=True)
+
+    urls: List[str] = []
+    for src, result in zip(sources, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"RSS fetch failed: {src} ({result})")
             continue
+        urls.extend(_parse_links(result))
     if max_items and len(urls) > max_items:
         urls = urls[:max_items]
     return urls
@@ -0,0 +1,14 @@
+from config import Config
+from src.utils.code_search import search_code
+
+
+def test_search_code_ascii_and_unicode_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'BASE_DIR', tmp_path)
+    (tmp_path / 'a.py').write_text('x = 1\nFooBar = 2\nfoobar()\n', encoding='utf-8')
+    (tmp_path / 'b.md').write_text('# 説明\nfooBAR を使う\n', encoding='utf-8')
+    (tmp_path / '__pycache__').mkdir()
+    (tmp_path / '__pycache__' / 'c.py').write_text('foobar\n', encoding='utf-8')
+
+    result = search_code('foobar')
+    found = sorted((m['file'].rsplit('/', 1)[-1], m['line']) for m in result['matches'])
+    assert found == [('a.py', 2), ('a.py', 3), ('b.md', 2)]
@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from src.utils.file_manager import atomic_write_bytes, atomic_write_text
+
+
+def test_atomic_write_text_and_bytes(tmp_path):
+    target = tmp_path / 'state.json'
+    atomic_write_text(target, '{"a": "日本"}')
+    assert target.read_text(encoding='utf-8') == '{"a": "日本"}'
+    atomic_write_bytes(target, b'{}')
+    assert target.read_bytes() == b'{}'
+    assert [p.name for p in tmp_path.iterdir()] == ['state.json']
+
+
+def test_atomic_write_concurrent_writers(tmp_path):
+    target = tmp_path / 'shared.txt'
+    payloads = [str(i) * 200_000 for i in range(8)]
+    errors = []
+
+    def write(data):
+        try:
+            for _ in range(5):
+                atomic_write_text(target, data)
+        except Exception as e:  # a shared temp name surfaces here as ENOENT
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(p,)) for p in payloads]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert target.read_text(encoding='utf-8') in payloads
+    assert [p.name for p in tmp_path.iterdir()] == ['shared.txt']
+
+
+def test_atomic_write_failure_leaves_target_and_no_temp(tmp_path):
+    target = tmp_path / 'keep.txt'
+    target.write_text('old', encoding='utf-8')
+    with pytest.raises(UnicodeEncodeError):
+        atomic_write_text(target, 'é', encoding='ascii')
+    assert target.read_text(encoding='utf-8') == 'old'
+    assert [p.name for p in tmp_path.iterdir()] == ['keep.txt']
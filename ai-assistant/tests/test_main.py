@@ -0,0 +1,22 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from config import Config
+
+main = pytest.importorskip('main')
+
+
+def test_find_relevant_files_counts_overlapping_keywords(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'PROJECT_ROOT', tmp_path)
+    # "login" also contains "log", so auth.py matches both keywords
+    (tmp_path / 'auth.py').write_text('def login():\n    pass\n', encoding='utf-8')
+    (tmp_path / 'audit.py').write_text('def log():\n    pass\n', encoding='utf-8')
+    # Walk audit.py first so a tie would keep it in front
+    monkeypatch.setattr(main, 'scandir_recursive', lambda root, exclude: sorted(
+        os.scandir(root), key=lambda e: e.name != 'audit.py'))
+    fake = SimpleNamespace(_auto_patch_exts=('.py',), _auto_patch_excludes=set())
+
+    found = main.AIAssistant._find_relevant_files(fake, 'login log', max_files=2)
+    assert found == ['auth.py', 'audit.py']
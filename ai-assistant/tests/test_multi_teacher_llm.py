@@ -0,0 +1,176 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from config import Config
+from multi_teacher_llm import MultiTeacherLLM, TeacherBatcher
+
+GOOD = 'This is a thorough answer. It has several sentences. Each one adds detail. ' * 3
+
+
+@pytest.fixture
+def mt(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DATA_DIR', tmp_path)
+    return MultiTeacherLLM()
+
+
+def test_batcher_cancels_dispatch_when_all_waiters_cancel():
+    cancelled = asyncio.Event()
+
+    async def dispatch(prompt, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def scenario():
+        batcher = TeacherBatcher(dispatch, max_batch=4, window_ms=0)
+        waiter = asyncio.ensure_future(batcher.submit('p'))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await batcher.close()
+
+    asyncio.run(scenario())
+
+
+def test_batcher_close_cancels_inflight_requests():
+    cancelled = asyncio.Event()
+
+    async def dispatch(prompt, **kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def scenario():
+        batcher = TeacherBatcher(dispatch, max_batch=4, window_ms=0)
+        waiter = asyncio.ensure_future(batcher.submit('p'))
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(batcher.close(), 1)
+        assert cancelled.is_set()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(scenario())
+
+
+def test_clear_winner_cancels_slow_teacher(mt, monkeypatch):
+    # Shipped 'code' weights: codegemma 0.4, llama2 0.3, mistral 0.2, neural-chat 0.1
+    slow_cancelled = []
+
+    async def query_teacher(name, prompt, **kwargs):
+        if name == 'codegemma':
+            return GOOD  # 0.85 * 0.4 = 0.34
+        if name in ('llama2', 'mistral'):
+            await asyncio.sleep(0.05)
+            return 'Short answer.'  # 0.5 * 0.3 = 0.15, 0.5 * 0.2 = 0.10
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            slow_cancelled.append(name)
+            raise
+        return GOOD
+
+    monkeypatch.setattr(mt, 'query_teacher', query_teacher)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            merged, _ = await mt.generate_ensemble('q', task_type='code')
+        finally:
+            await mt.close_session()
+        return merged, loop.time() - started
+
+    # neural-chat can reach at most 0.1, so 0.34 > 2 * max(0.15, 0.1) settles it
+    merged, elapsed = asyncio.run(scenario())
+    assert merged == GOOD
+    assert elapsed < 2
+    assert slow_cancelled == ['neural-chat']
+
+
+def test_merge_combines_without_clear_winner(mt):
+    responses = {name: GOOD for name in mt._teacher_order}
+    merged, _ = mt.merge_responses(responses, task_type='code')
+    assert merged != GOOD and merged.startswith(GOOD)
+
+
+def test_ensemble_stats_fold_in_other_writers(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DATA_DIR', tmp_path)
+    monkeypatch.setattr(Config, 'ENSEMBLE_LOG_FLUSH_EVERY', 1)
+    first, second = MultiTeacherLLM(), MultiTeacherLLM()
+    first._log_ensemble('a', {'x': 'r', 'y': 'r'}, 'm', {}, 'general')
+    second._log_ensemble('b', {'x': 'r'}, 'm', {}, 'general')
+    first._log_ensemble('c', {'x': 'r', 'y': ''}, 'm', {}, 'general')
+
+    stats = first.get_teacher_stats()
+    assert stats['total_ensembles'] == 3
+    assert stats['avg_responses_per_ensemble'] == pytest.approx(4 / 3)
+
+    log = tmp_path / 'ensemble_log.jsonl'
+    sidecar = json.loads((tmp_path / 'ensemble_log.stats.json').read_text())
+    assert sidecar['count'] == len(log.read_text(encoding='utf-8').splitlines())
+    assert sidecar['offset'] == log.stat().st_size
+    first.close_log()
+    second.close_log()
+
+
+class _FakeResponse:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def json(self):
+        return {'response': 'ok'}
+
+
+class _FakeSession:
+    def __init__(self):
+        self.urls = []
+
+    def post(self, url, **kwargs):
+        self.urls.append(url)
+        return _FakeResponse()
+
+
+@pytest.mark.parametrize('per_teacher, expected', [
+    (False, Config.OLLAMA_BASE_URL),
+    (True, 'http://localhost:11435'),
+])
+def test_query_teacher_resolves_provider_url(mt, monkeypatch, per_teacher, expected):
+    monkeypatch.setattr(Config, 'MULTI_TEACHER_PER_TEACHER_URLS', per_teacher)
+    monkeypatch.setattr('llm_manager.select_provider', lambda *a: 'ollama')
+    session = _FakeSession()
+
+    async def start_session():
+        return session
+
+    monkeypatch.setattr(mt, 'start_session', start_session)
+    mt.teachers['mistral']._model_checked = True
+
+    assert asyncio.run(mt.query_teacher('mistral', 'hi')) == 'ok'
+    assert session.urls == [f'{expected}/api/generate']
+
+
+def test_query_teacher_skips_missing_model(mt, monkeypatch):
+    monkeypatch.setattr('llm_manager.select_provider', lambda *a: 'ollama')
+    monkeypatch.setattr(mt.teachers['mistral'], '_ensure_model_available', lambda: False)
+    session = _FakeSession()
+
+    async def start_session():
+        return session
+
+    monkeypatch.setattr(mt, 'start_session', start_session)
+    assert asyncio.run(mt.query_teacher('mistral', 'hi')) == ''
+    assert session.urls == []
@@ -0,0 +1,22 @@
+from pii_filter import detect_pii, sanitize
+
+
+def test_sanitize_address_before_name():
+    # The address pass runs first, so the name match cannot swallow 東京都
+    assert sanitize('東京都太郎さん') == '東京[ADDRESS_PART][NAME_REMOVED]'
+    assert sanitize('市川さん') == '[ADDRESS_PART]川さん'
+
+
+def test_sanitize_categories():
+    text = 'support@example.com か +81-90-1234-5678、カード 4111 1111 1111 1111'
+    out = sanitize(text)
+    assert '[EMAIL_REMOVED]' in out
+    assert '[PHONE_REMOVED]' in out
+    assert '[CREDIT_CARD_REMOVED]' in out
+    assert 'example.com' not in out and '4111' not in out
+
+
+def test_detect_pii():
+    assert detect_pii('連絡先 support@example.com')
+    assert detect_pii('山田さんに聞く')
+    assert not detect_pii('hello world')
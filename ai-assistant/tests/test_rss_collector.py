@@ -0,0 +1,22 @@
+from src.utils.rss_collector import _parse_links
+
+
+def test_parse_links_rss_and_atom():
+    rss = b'<rss><channel><item><link>http://a/1</link></item><item><link>http://a/1</link></item></channel></rss>'
+    atom = (b'<feed xmlns="http://www.w3.org/2005/Atom">'
+            b'<entry><link href="http://b/1"/></entry></feed>')
+    assert _parse_links(rss) == ['http://a/1']
+    assert _parse_links(atom) == ['http://b/1']
+
+
+def test_parse_links_shift_jis_feed():
+    feed = ('<?xml version="1.0" encoding="Shift_JIS"?>'
+            '<rss><channel><title>ニュース</title>'
+            '<item><title>記事一</title><link>http://example.jp/1</link></item>'
+            '<item><title>記事二</title><link>http://example.jp/2</link></item>'
+            '</channel></rss>').encode('shift_jis')
+    assert _parse_links(feed) == ['http://example.jp/1', 'http://example.jp/2']
+
+
+def test_parse_links_broken_feed():
+    assert _parse_links(b'<rss><item><link>') == []
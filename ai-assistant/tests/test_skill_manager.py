@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from config import Config
+import skill_manager
+from skill_manager import SkillManager
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'MEMORY_FILE', tmp_path / 'memory.json')
+    return SkillManager()
+
+
+def test_failed_flush_keeps_updates_pending(manager, monkeypatch):
+    def fail(path, data):
+        raise OSError(28, 'No space left on device')
+
+    manager.learn_skill('code_generation', 0.9)
+    monkeypatch.setattr(skill_manager, 'atomic_write_bytes', fail)
+    manager.flush()
+    assert manager._dirty
+    assert not Config.MEMORY_FILE.exists()
+
+    monkeypatch.undo()
+    monkeypatch.setattr(Config, 'MEMORY_FILE', manager.memory_file)
+    manager.flush()
+    assert not manager._dirty
+    saved = json.loads(manager.memory_file.read_text(encoding='utf-8'))
+    assert any(s['name'] == 'code_generation' for s in saved['learned_skills'])
+
+
+def test_get_status_does_not_write(manager):
+    manager.learn_skill('code_generation', 0.9)
+    manager.get_status()
+    assert not manager.memory_file.exists()
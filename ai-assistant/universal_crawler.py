@@ -15,6 +15,7 @@ Status: Perfect AI Phase 1 で導入、継続拡張中
 import asyncio
 import logging
 import json
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
@@ -24,6 +25,7 @@ import aiohttp
 from bs4 import BeautifulSoup
 
 from config import Config
+from src.utils.file_manager import atomic_write_text
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -134,6 +136,7 @@ class UniversalCrawler:
     
     def __init__(self):
         self.session: aiohttp.ClientSession = None
+        self._active_crawls = 0
         self.crawled_dir = Config.DATA_DIR / 'crawled'
         self.crawled_dir.mkdir(exist_ok=True)
         self.crawl_index = self.crawled_dir / 'index.json'
@@ -141,7 +144,7 @@ class UniversalCrawler:
     
     async def start_session(self):
         """Initialize async HTTP session"""
-        if not self.session:
+        if self.session is None or self.session.closed:
             self.session = aiohttp.ClientSession()
     
     async def close_session(self):
@@ -156,11 +159,33 @@ class UniversalCrawler:
                 self.index = json.load(f)
         else:
             self.index = {}
+        # Per-specialty/source counts are kept up to date as pages are added,
+        # so get_crawl_stats does not rescan the whole index
+        self._by_specialty = Counter()
+        self._by_source_type = Counter()
+        for meta in self.index.values():
+            self._count(meta)
+        self._index_dirty = False
+    
+    def _count(self, meta: Dict[str, Any]):
+        self._by_specialty[meta.get('specialty', 'unknown')] += 1
+        self._by_source_type[meta.get('source_type', 'unknown')] += 1
+    
+    def _mark_crawled(self, url: str, meta: Dict[str, Any]):
+        # Concurrent specialty crawls can both fetch a URL before either marks it;
+        # the first mark wins so the page is counted once
+        if url in self.index:
+            return
+        self.index[url] = meta
+        self._count(meta)
+        self._index_dirty = True
     
     def save_index(self):
-        """Save crawl index"""
-        with open(self.crawl_index, 'w', encoding='utf-8') as f:
-            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        """Save crawl index (only when pages were added; compact, written atomically)"""
+        if not self._index_dirty:
+            return
+        atomic_write_text(self.crawl_index, json.dumps(self.index, separators=(',', ':'), ensure_ascii=False))
+        self._index_dirty = False
     
     async def crawl_specialty(self, specialty: str, max_pages: int = 100) -> int:
         """Crawl knowledge for a specific specialty"""
@@ -170,31 +195,37 @@ class UniversalCrawler:
             return 0
         
         await self.start_session()
+        self._active_crawls += 1
         
         sources = self.KNOWLEDGE_SOURCES[specialty]
         total_crawled = 0
         
         logger.info(f'Starting crawl for {specialty}...')
         
-        # Crawl each source type
-        for source_type, urls in sources.items():
-            logger.info(f'  Crawling {source_type}...')
-            
-            for url in urls[:5]:  # limit to 5 per type
-                try:
-                    crawled = await self._crawl_url(
-                        url, 
-                        specialty, 
-                        source_type,
-                        max_pages=max_pages // len(urls)
-                    )
-                    total_crawled += crawled
-                    await asyncio.sleep(2)  # rate limiting
-                except Exception as e:
-                    logger.error(f'Error crawling {url}: {e}')
-        
-        await self.close_session()
-        self.save_index()
+        try:
+            # Crawl each source type
+            for source_type, urls in sources.items():
+                logger.info(f'  Crawling {source_type}...')
+                
+                for url in urls[:5]:  # limit to 5 per type
+                    try:
+                        crawled = await self._crawl_url(
+                            url, 
+                            specialty, 
+                            source_type,
+                            max_pages=max_pages // len(urls)
+                        )
+                        total_crawled += crawled
+                        await asyncio.sleep(2)  # rate limiting
+                    except Exception as e:
+                        logger.error(f'Error crawling {url}: {e}')
+        finally:
+            # Concurrent crawls share the session; the last one to finish closes it.
+            # Also runs on cancellation so the counter, session and index stay consistent
+            self._active_crawls -= 1
+            if self._active_crawls == 0:
+                await self.close_session()
+            self.save_index()
         
         logger.info(f'✅ Crawled {total_crawled} pages for {specialty}')
         return total_crawled
@@ -223,12 +254,12 @@ class UniversalCrawler:
                     self._save_content(url, text, specialty, source_type)
                     
                     # Mark as crawled
-                    self.index[url] = {
+                    self._mark_crawled(url, {
                         'specialty': specialty,
                         'source_type': source_type,
                         'crawled_at': datetime.now().isoformat(),
                         'content_length': len(text),
-                    }
+                    })
                     
                     logger.info(f'  ✅ Crawled: {urlparse(url).netloc}')
                     
@@ -308,25 +339,11 @@ class UniversalCrawler:
     
     def get_crawl_stats(self) -> Dict[str, Any]:
         """Get crawling statistics"""
-        stats = {
+        return {
             'total_urls': len(self.index),
-            'by_specialty': {},
-            'by_source_type': {},
+            'by_specialty': dict(self._by_specialty),
+            'by_source_type': dict(self._by_source_type),
         }
-        
-        for url, meta in self.index.items():
-            spec = meta.get('specialty', 'unknown')
-            source = meta.get('source_type', 'unknown')
-            
-            if spec not in stats['by_specialty']:
-                stats['by_specialty'][spec] = 0
-            stats['by_specialty'][spec] += 1
-            
-            if source not in stats['by_source_type']:
-                stats['by_source_type'][source] = 0
-            stats['by_source_type'][source] += 1
-        
-        return stats
 
 async def main():
     """Test crawler"""
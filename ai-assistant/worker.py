@@ -31,6 +31,7 @@ from patch_validator import PatchValidator
 from src.utils.rss_collector import load_sources, collect_from_sources
 from src.utils.local_doc_ingest import ingest_local_docs_to_clean
 from src.utils.learning_brains import get_brain_tasks
+from src.utils.code_search import scandir_recursive
 from multi_teacher_llm import MultiTeacherLLM
 
 logger = logging.getLogger(__name__)
@@ -516,9 +517,16 @@ class Worker:
         if self.multi_teacher:
             try:
                 import asyncio
-                text, meta = asyncio.run(
-                    self.multi_teacher.generate_ensemble(prompt, task_type=task_type, temperature=0.2)
-                )
+
+                async def _ensemble():
+                    try:
+                        return await self.multi_teacher.generate_ensemble(
+                            prompt, task_type=task_type, temperature=0.2
+                        )
+                    finally:
+                        await self.multi_teacher.close_session()
+
+                text, meta = asyncio.run(_ensemble())
                 if text and not text.startswith('エラー:'):
                     return text
             except Exception as e:
@@ -642,20 +650,15 @@ class Worker:
             if (Config.PROJECT_ROOT / p).exists():
                 candidates.append(p)
 
-        exts = set(Config.AUTO_PATCH_CANDIDATE_EXTS or [".py"])
-        exclude_dirs = set(Config.AUTO_PATCH_EXCLUDE_DIRS or [])
+        suffixes = tuple(Config.AUTO_PATCH_CANDIDATE_EXTS or [".py"])
+        exclude_dirs = frozenset(Config.AUTO_PATCH_EXCLUDE_DIRS or [])
         max_candidates = int(Config.AUTO_PATCH_MAX_CANDIDATES or 0)
 
-        for p in Config.PROJECT_ROOT.rglob("*"):
-            if p.is_dir():
-                if p.name in exclude_dirs:
-                    continue
-                continue
-            if p.suffix not in exts:
-                continue
-            parts = set(p.parts)
-            if parts.intersection(exclude_dirs):
+        # Excluded dirs are pruned during the walk, so their contents are never listed
+        for entry in scandir_recursive(Config.PROJECT_ROOT, exclude_dirs):
+            if not entry.name.endswith(suffixes):
                 continue
+            p = Path(entry.path)
             rel = p.relative_to(Config.PROJECT_ROOT).as_posix()
             if rel not in candidates:
                 candidates.append(rel)